@@ -5,7 +5,6 @@ import sys
 import time
 
 import os
-import pickle
 from pygame_gui.ui_manager import UIManager
 from pygame_gui.elements import UIPanel, UIButton, UILabel, UITextEntryLine, UIScrollingContainer, UIStatusBar
 
@@ -1,5 +1,7 @@
 import pygame
 from Container.imports_library import *
+from Engine.spatial_hash import SpatialHash
+from Engine.assets import AssetManager
 
 class GridSystem:
     def __init__(self, rect, grid_size=(4, 3), cell_padding=10):
@@ -13,6 +15,8 @@ class GridSystem:
 
         # Initialize grid with None (empty cells)
         self.grid = [[None for _ in range(grid_size[0])] for _ in range(grid_size[1])]
+        self.card_cells = {}  # card -> (row, col), the reverse of grid
+        self.free_cells = grid_size[0] * grid_size[1]
 
         # Precompute cell positions
         self.cell_positions = [[(
@@ -22,7 +26,10 @@ class GridSystem:
 
     def add_card(self, card, row, col):
         if 0 <= row < self.grid_size[1] and 0 <= col < self.grid_size[0] and self.grid[row][col] is None:
+            self.remove_card(card)  # A card sits in one cell at a time
             self.grid[row][col] = card
+            self.card_cells[card] = (row, col)
+            self.free_cells -= 1
             card.x, card.y = self.cell_positions[row][col]
             card.original_y = card.y
             card.grid_pos = (row, col)
@@ -30,19 +37,48 @@ class GridSystem:
         return False
 
     def remove_card(self, card):
-        for row in range(self.grid_size[1]):
-            for col in range(self.grid_size[0]):
-                if self.grid[row][col] == card:
-                    self.grid[row][col] = None
-                    return True
-        return False
+        cell = self.card_cells.pop(card, None)
+        if cell is None:
+            return False
+        row, col = cell
+        self.grid[row][col] = None
+        self.free_cells += 1
+        return True
+
+    def get_cell_at(self, pos):
+        """(row, col) of the cell whose centre is closest to pos, clamped to the grid."""
+        x, y = pos
+        first_x, first_y = self.cell_positions[0][0]
+        col = round((x - first_x - self.cell_width / 2) / (self.cell_width + self.cell_padding))
+        row = round((y - first_y - self.cell_height / 2) / (self.cell_height + self.cell_padding))
+        return (min(max(row, 0), self.grid_size[1] - 1), min(max(col, 0), self.grid_size[0] - 1))
+
+    def get_cell_distance(self, pos, row, col):
+        cell_x, cell_y = self.cell_positions[row][col]
+        return (pos[0] - (cell_x + self.cell_width / 2)) ** 2 + (pos[1] - (cell_y + self.cell_height / 2)) ** 2
 
     def get_nearest_cell(self, pos):
-        x, y = pos
-        return min(((row, col) for row in range(self.grid_size[1]) for col in range(self.grid_size[0]) if self.grid[row][col] is None),
-                   key=lambda rc: ((x - (self.cell_positions[rc[0]][rc[1]][0] + self.cell_width / 2)) ** 2 +
-                                   (y - (self.cell_positions[rc[0]][rc[1]][1] + self.cell_height / 2)) ** 2) ** 0.5,
-                   default=None)
+        """Nearest empty cell, searched in growing rings around the cell under pos."""
+        if not self.free_cells:
+            return None
+        center_row, center_col = self.get_cell_at(pos)
+        columns, rows = self.grid_size
+        pitch = min(self.cell_width, self.cell_height) + self.cell_padding
+        best = None  # (squared distance, row, col); ties go to the first cell in row order
+        for radius in range(max(columns, rows)):
+            # Every cell in this ring and beyond is at least this far away
+            if best is not None and ((radius - 0.5) * pitch) ** 2 > best[0]:
+                break
+            for row in range(max(center_row - radius, 0), min(center_row + radius, rows - 1) + 1):
+                on_edge = abs(row - center_row) == radius
+                for col in range(max(center_col - radius, 0), min(center_col + radius, columns - 1) + 1):
+                    if not on_edge and abs(col - center_col) != radius:
+                        continue
+                    if self.grid[row][col] is None:
+                        candidate = (self.get_cell_distance(pos, row, col), row, col)
+                        if best is None or candidate < best:
+                            best = candidate
+        return best[1:] if best is not None else None
 
     def snap_to_grid(self, card, pos):
         if self.is_position_in_grid(pos):
@@ -62,50 +98,124 @@ class GridSystem:
                     pygame.draw.rect(screen, (100, 100, 100), (*self.cell_positions[row][col], self.cell_width, self.cell_height), 1)
 
 class CardDeck_Display(pygame.sprite.Sprite):
-    def __init__(self, pos, size, screen_size, back_image_path, front_image_path, grid_system):
+    def __init__(self, pos, size, screen_size, back_image_path, front_image_path, grid_system, assets=None):
         super().__init__()
         self.x, self.y = pos
         self.screenWidth, self.screenHeight = screen_size
         self.original_x = self.x
         self.width, self.height = size
-        self.image_back = pygame.image.load(back_image_path)
-        self.image_back = pygame.transform.rotate(pygame.transform.scale(self.image_back, (self.width, self.height)), 90)
+        self.assets = assets or AssetManager()
+        self.image_back = self.assets.get(back_image_path, (self.width, self.height), 90)
 
         self.image_front = front_image_path
+        self.card_size = (80, 110)
         self.grid_system = grid_system
-        self.cards = []
+        self.cards = []  # Bottom to top
+        self.card_group = pygame.sprite.LayeredDirty()  # Draws the cards in layer order
+        self.hit_grid = SpatialHash()  # Card rects, for hit-testing the mouse
+        self.top_layer = 0
+        self.hovered = None  # Card under the mouse
+        self.dragged = None  # Card being dragged
+        self.drawn_rects = []  # Deck and card rects as last drawn
+
+    def preload(self):
+        """Load the card face ahead of the first click, so spawning a card does no disk I/O."""
+        self.assets.get(self.image_front, self.card_size, atlas=True)
 
     def draw(self, screen):
         screen.blit(self.image_back, (self.x, self.y))  # draw image
 
-        for card in self.cards:
-            card.draw(screen)
+        self.card_group.draw(screen)
+        self.drawn_rects = self.get_rects()
+
+    def get_rects(self):
+        return [self.image_back.get_rect(topleft=(self.x, self.y))] + [card.rect.copy() for card in self.cards]
+
+    def get_dirty_rects(self):
+        """Old and new rects of the deck and any card that moved, appeared or disappeared since the last draw."""
+        rects = self.get_rects()
+        if rects == self.drawn_rects:
+            return []
+        return [rect for rect in rects if rect not in self.drawn_rects] + [rect for rect in self.drawn_rects if rect not in rects]
+
+    def add_card(self, card):
+        self.cards.append(card)
+        self.card_group.add(card, layer=self.top_layer)
+        self.top_layer += 1
+        self.move_card(card)
+
+    def bring_to_front(self, card):
+        self.cards.remove(card)
+        self.cards.append(card)
+        self.card_group.change_layer(card, self.top_layer)
+        self.top_layer += 1
+
+    def move_card(self, card):
+        # Keep the sprite rect and the hit grid in step with card.x/card.y
+        card.update_rect()
+        self.hit_grid.insert(card, card.rect)
+
+    def get_card_at(self, pos):
+        """Topmost card under pos, or None."""
+        hits = self.hit_grid.query_point(pos)
+        if not hits:
+            return None
+        return max(hits, key=self.card_group.get_layer_of_sprite)
+
+    def set_hovered(self, card):
+        if card is self.hovered:
+            return
+        for changed, hovered in ((self.hovered, False), (card, True)):
+            if changed is not None and changed is not self.dragged:
+                changed.set_hover(hovered)
+                self.move_card(changed)
+        self.hovered = card
 
     def handle_event(self, event):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
+        mouse_x, mouse_y = getattr(event, "pos", None) or pygame.mouse.get_pos()
         mouse_over = self.x < mouse_x < self.x + self.width and self.y < mouse_y < self.y + self.height
         if mouse_over:
             self.x = self.original_x - 10
         else:
             self.x = self.original_x
 
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            card = self.get_card_at((mouse_x, mouse_y))
+            if card is not None:
+                self.dragged = card
+                card.start_drag(self.grid_system)
+                self.bring_to_front(card)
+
+        elif event.type == pygame.MOUSEBUTTONUP and self.dragged is not None:
+            card, self.dragged = self.dragged, None
+            card.drop(self.grid_system)
+            self.move_card(card)
+            self.hovered = None  # Re-evaluated below from the card's new place
+
+        elif event.type == pygame.MOUSEMOTION and self.dragged is not None:
+            self.dragged.drag_to((mouse_x, mouse_y))
+            self.move_card(self.dragged)
+
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-            card = Card_Display((109, 109), (80, 110), (self.screenWidth, self.screenHeight), self.image_front)
+            card = Card_Display((109, 109), self.card_size, (self.screenWidth, self.screenHeight), self.image_front, self.assets)
             self.grid_system.add_card(card,0,0)
-            self.cards.append(card)
+            self.add_card(card)
 
-        for card in self.cards:
-            card.handle_event(event, self.grid_system)
+        if self.dragged is None:
+            self.set_hovered(self.get_card_at((mouse_x, mouse_y)))
 
 
-class Card_Display(pygame.sprite.Sprite):
-    def __init__(self, pos, size, screen_size, front_image_path):
+class Card_Display(pygame.sprite.DirtySprite):
+    def __init__(self, pos, size, screen_size, front_image_path, assets=None):
         super().__init__()
         self.x, self.y = pos
         self.WIDTH, self.HEIGHT = screen_size
         self.width, self.height = size
         self.original_y = self.y
-        self.image = pygame.transform.scale(pygame.image.load(front_image_path), (self.width, self.height))
+        # Shared with every other card of the same face, never modify it in place
+        self.image = (assets or AssetManager()).get(front_image_path, size, atlas=True)
+        self.rect = self.image.get_rect(topleft=(self.x, self.y))
+        self.dirty = 2  # The frame pipeline recomposites everything under a card, so it is always redrawn
         self.dragging = False
         self.grid_pos = None
         self.in_grid = False
@@ -113,29 +223,27 @@ class Card_Display(pygame.sprite.Sprite):
     def draw(self, screen):
         screen.blit(self.image, (self.x, self.y))
 
-    def handle_event(self, event, grid):
-        mouse_x, mouse_y = pygame.mouse.get_pos()
-        mouse_over = self.x < mouse_x < self.x + self.width and self.y < mouse_y < self.y + self.height
-        if mouse_over and not self.dragging:
-            self.y = self.original_y - 10
-        elif not self.dragging and not mouse_over:
-            self.y = self.original_y
-
-        if event.type == pygame.MOUSEBUTTONDOWN and mouse_over:
-            self.dragging = True
-            if grid and self.in_grid:
-                grid.remove_card(self)
-                self.in_grid = False
-                self.grid_pos = None
-
-        elif event.type == pygame.MOUSEBUTTONUP:
-            self.dragging = False
-            if grid and grid.snap_to_grid(self, (self.x + self.width / 2, self.y + self.height / 2)):
-                self.in_grid = True
-            else:
-                self.y = self.y
-
-        elif event.type == pygame.MOUSEMOTION and self.dragging:
-            self.x = max(0, min(mouse_x - self.width / 2, self.WIDTH - self.width))
-            self.y = max(0, min(mouse_y - self.height / 2, self.HEIGHT - self.height))
-            self.original_y = self.y
\ No newline at end of file
+    def update_rect(self):
+        self.rect.topleft = (self.x, self.y)
+
+    def set_hover(self, hovered):
+        # Hovered cards lift up a little
+        self.y = self.original_y - 10 if hovered else self.original_y
+
+    def start_drag(self, grid):
+        self.dragging = True
+        if grid and self.in_grid:
+            grid.remove_card(self)
+            self.in_grid = False
+            self.grid_pos = None
+
+    def drop(self, grid):
+        self.dragging = False
+        if grid and grid.snap_to_grid(self, (self.x + self.width / 2, self.y + self.height / 2)):
+            self.in_grid = True
+
+    def drag_to(self, pos):
+        mouse_x, mouse_y = pos
+        self.x = max(0, min(mouse_x - self.width / 2, self.WIDTH - self.width))
+        self.y = max(0, min(mouse_y - self.height / 2, self.HEIGHT - self.height))
+        self.original_y = self.y
@@ -1,4 +1,5 @@
 from Container.imports_library import *
+from Engine.weather_log import WeatherLog
 
 # details
 class Details_Panel:
@@ -6,10 +7,17 @@ class Details_Panel:
         self.ui_manager = ui_manager
         self.weather = weather  # Link to the Weather class
         self.details_panel = UIPanel(relative_rect=pygame.Rect((10, 10), (450, 250)), manager=self.ui_manager, starting_height=1)
-        self.PATH = os.path.join(os.getcwd(), "Data/weather_tracker.pkl")
-        self.previous_data = self.load_data(self.PATH)
+        self.PATH = os.path.join(os.getcwd(), "Data/weather_tracker.log")
+        self.LEGACY_PATH = os.path.join(os.getcwd(), "Data/weather_tracker.pkl")  # Imported once into the log
+        self.history = WeatherLog(self.PATH, legacy_path=self.LEGACY_PATH)  # Read by load_history, after the first frame
+        self.previous_data = None  # Newest saved record, to skip duplicates
+        self.pending_reports = []  # Changes before load_history, saved by it
         self.last_update = pygame.time.get_ticks()
+        self.shown_version = None  # Weather.version currently on the labels
         self._build()
+        # Every new set of weather values is saved once, when it happens
+        self.weather.subscribe(self.on_weather_change)
+        self.on_weather_change(self.weather)
 
     def _build(self):
         """Create UI elements for displaying weather details."""
@@ -23,8 +31,10 @@ class Details_Panel:
         self.exposure_risk = UILabel(relative_rect=pygame.Rect((0, 200), (444, 20)), manager=self.ui_manager, container=self.details_panel, text="Frostbite Risk: --")
 
     def update(self):
-        """Fetch weather data and update the UI."""
-        self.weather.update()  # Update weather conditions
+        """Update the UI, only when the weather changed since it was last shown. Returns True if it did."""
+        if self.weather.version == self.shown_version:
+            return False
+        self.shown_version = self.weather.version
         self.weather_report = self.weather.get_weather_report()
         self.current_temperature.set_text(f"Current: {self.weather_report["Temperature"]}°C")
         self.weather_type.set_text(f"Weather: {self.weather_report["Weather"]}")
@@ -34,56 +44,61 @@ class Details_Panel:
         self.visibility.set_text(f"Visibility: {self.weather_report["Visibility"]}")
         self.precipitation.set_text(f"Precipitation: {self.weather_report["Precipitation"]}")
         self.exposure_risk.set_text(f"Frostbite Risk: {self.weather_report["Exposure risk"]}")
+        return True
+
+    def on_weather_change(self, weather):
+        if not weather.record_change:
+            return  # Only the region at the camera changed, see Weather.update_region
+        weather_report = weather.get_weather_report()
+        if self.pending_reports is not None:
+            self.pending_reports.append(weather_report)
+            return
+        self.save_report(weather_report)
+
+    def load_history(self):
+        """Check the history log and save the changes that happened before, so startup never waits on it."""
+        self.previous_data = self.history.read_last()  # Only the newest record is needed to skip duplicates
+        pending, self.pending_reports = self.pending_reports, None
+        for weather_report in pending or []:
+            self.save_report(weather_report)
+
+    def save_report(self, weather_report):
         # save data
-        if self.previous_data != self.weather_report:
-            self.save_weather_data(self.PATH, self.weather_report)
-            self.previous_data = self.weather_report
+        if self.previous_data != weather_report:
+            self.save_weather_data(self.PATH, weather_report)
+            self.previous_data = weather_report
+
+    def open_log(self, PATH):
+        if PATH == self.history.path:
+            return self.history
+        return WeatherLog(PATH)
 
     def save_weather_data(self, PATH, new_data):
         try:
-            # Load existing data if file exists
-            if os.path.exists(PATH):
-                with open(PATH, 'rb') as file:
-                    try:
-                        data = pickle.load(file)
-                    except EOFError:
-                        data = []
-            else:
-                # If file doesn't exist, initialize an empty list
-                data = []
-
-            # Append new data to the existing data
-            data.append(new_data)
-
-            # Save the updated data back to the file
-            with open(PATH, 'wb') as file:
-                pickle.dump(data, file)
-
+            # One record appended to the end of the log
+            self.open_log(PATH).append(new_data)
             print(f"Data saved to {os.path.abspath(PATH)}")
         except Exception as e:
             print(f"Error saving data: {e}")
 
     def delete_weather_data(self, PATH):
         try:
-            with open(PATH, 'wb') as file:
-                pickle.dump([], file)
+            self.open_log(PATH).clear()
             print(f"All data in '{PATH}' has been cleared.")
         except Exception as e:
             print(f"Error saving data: {e}")
 
     def load_data(self, PATH):
         # Check if the file exists and has data
-        try:
-            with open(PATH, 'rb') as file:
-                data = pickle.load(file)
-                return data
-        except FileNotFoundError:
+        if not os.path.exists(PATH):
             print(f"The file '{PATH}' does not exist.")
             return None
-        except EOFError:
+        data = self.open_log(PATH).read_all()
+        if not data:
             # Handles the case where the file exists but is empty
             print(f"The file '{PATH}' is empty.")
             return None
+        return data
 
     def handle_event(self, event, weather_window=None):
         if self.current_temperature.process_event(event) and not None:
@@ -100,6 +115,7 @@ class WeatherContent:
         self.weather_report = weather_report
         self.window_container = None
         self.labels = {}
+        self.index = None  # List position this panel currently shows
 
     def build(self, index):
         # Panel container
@@ -144,27 +160,46 @@ class WeatherContent:
         for key, label in self.labels.items():
             label.set_text(data[key])
 
+    def bind(self, index, weather_report):
+        """Reuse this panel for another entry of a virtual list."""
+        if index != self.index or weather_report is not self.weather_report:
+            self.index = index
+            self.weather_report = weather_report
+            self.window_container.set_relative_position((5, index * (self.window_height + 10)))
+            self.update()
+        if not self.window_container.visible:
+            self.window_container.show()
+
+    def hide(self):
+        if self.window_container.visible:
+            self.window_container.hide()
+
+    def kill(self):
+        self.window_container.kill()
+
 class WeatherWindow:
     def __init__(self, ui_manager, screen_size, details_panel):
         self.ui_manager = ui_manager
         self.screen_width, self.screen_height = screen_size
         self.window_x, self.window_y = 465, 10
-        self.weather_list = []
+        self.weather_list = None  # VirtualList of recycled WeatherContent panels
         self.window_open = False
-        self.PATH = os.path.join(os.getcwd(), "Data/weather_tracker.pkl")
+        self.PATH = details_panel.PATH
         self.details_panel = details_panel
-        self.previous_data = details_panel.load_data(self.PATH)
-        self.previous_data = []
+        self.previous_data = []  # History is read when the window is first opened
+        self.cursor = None  # Position in the history log up to which panels exist
         # Track last update time to avoid excessive updates
         self.last_update_time = 0
         self.update_interval = 1000
+        # New records show up as soon as the weather changes (subscribed after the panel, which saves them)
+        details_panel.weather.subscribe(self.on_weather_change)
 
         if self.window_open:
             self._build()
 
     def _build(self):
         # Load the latest data from the file
-        self.previous_data = self.details_panel.load_data(self.PATH) or []
+        self.previous_data, self.cursor, _ = self.details_panel.history.read_since(None)
 
         self.center_panel = pygame_gui.elements.UIPanel(
             relative_rect=pygame.Rect((self.window_x, self.window_y), (self.screen_width - 470, self.screen_height - 20)),
@@ -207,20 +242,26 @@ class WeatherWindow:
         self._create_weather_panels()
 
     def _create_weather_panels(self):
-        """Creates weather panels for all data entries"""
-        # Clear existing weather panels
-        self.weather_list = []
-
-        # Calculate content height based on number of entries
-        content_height = (250 * len(self.previous_data)) + 250
-        self.scroll_container.set_scrollable_area_dimensions((self.screen_width - 520, max(content_height, self.screen_height - 100)))
-
-        # Create new panels for each data entry
-        for i, item in enumerate(self.previous_data):
-            weather_panel = WeatherContent(self.ui_manager, (self.screen_width - 550, 250), self.scroll_container, item)
-            weather_panel.build(i)
-            weather_panel.update()
-            self.weather_list.append(weather_panel)
+        """Creates a virtual list of weather panels for all data entries"""
+        # Only the panels that fit in the viewport (plus a buffer) are ever built
+        from Displays.virtual_list import VirtualList  # Only needed once the window opens
+        panel_size = (self.screen_width - 550, 250)
+        self.weather_list = VirtualList(self.scroll_container, panel_size, 10, lambda: self._create_weather_panel(panel_size))
+        self.weather_list.set_items(self.previous_data)
+
+    def _create_weather_panel(self, panel_size):
+        weather_panel = WeatherContent(self.ui_manager, panel_size, self.scroll_container, None)
+        weather_panel.build(0)
+        return weather_panel
+
+    def _add_weather_panels(self, records):
+        """Adds new entries below the existing ones"""
+        self.weather_list.extend(records)
+
+    def update_visible_panels(self):
+        """Rebind recycled panels to the entries at the current scroll position."""
+        if self.window_open and self.weather_list is not None:
+            self.weather_list.refresh()
 
     def update(self):
         """Check for new data and update the display if needed"""
@@ -232,27 +273,40 @@ class WeatherWindow:
         # Only check for updates at set intervals to avoid performance issues
         if current_time - self.last_update_time > self.update_interval:
             self.last_update_time = current_time
+            self.refresh_history()
+
+    def on_weather_change(self, weather):
+        if self.window_open and self.weather_list is not None:
+            self.refresh_history()
 
-            # Load latest data from file
-            latest_data = self.details_panel.load_data(self.PATH) or []
+    def refresh_history(self):
+        """Add panels for records appended to the history since the last read"""
+        # A stat call decides whether anything was appended or cleared
+        history = self.details_panel.history
+        if not history.changed_since(self.cursor):
+            return
+        records, self.cursor, reset = history.read_since(self.cursor)
 
-            # Check if data has changed (new entries added or entries removed)
-            if len(latest_data) != len(self.previous_data):
-                # Data has changed, rebuild the panels
-                self.previous_data = latest_data
+        if reset:
+            # Log was cleared or rewritten, rebuild the panels
+            self.previous_data = records
 
-                # Remove existing panels
-                for panel in self.weather_list:
-                    if hasattr(panel, 'window_container') and panel.window_container:
-                        panel.window_container.kill()
+            # Remove existing panels
+            if self.weather_list is not None:
+                self.weather_list.kill()
 
-                # Create new panels
-                self._create_weather_panels()
+            # Create new panels
+            self._create_weather_panels()
+        elif records:
+            # Only the records appended since the last read get panels
+            self.previous_data.extend(records)
+            self._add_weather_panels(records)
 
     def close_store(self):
         """Closes and removes the planet store UI from the screen."""
         if hasattr(self, 'center_panel') and self.center_panel:
             self.center_panel.kill()
+            self.weather_list = None
             self.window_open = False
 
     def toggle_store(self):
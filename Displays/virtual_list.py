@@ -0,0 +1,62 @@
+import math
+
+# virtual list
+class VirtualList:
+    """Scrolling list that only creates enough rows to fill the viewport plus a buffer.
+
+    Rows are recycled as the user scrolls: make_row() builds one, and rows need
+    bind(index, item) to show an item at a list position, and hide() when unused.
+    """
+    def __init__(self, scroll_container, row_size, row_spacing, make_row, buffer_rows=2):
+        self.scroll_container = scroll_container
+        self.row_width, self.row_height = row_size
+        self.row_stride = self.row_height + row_spacing
+        self.make_row = make_row
+        self.buffer_rows = buffer_rows
+        self.items = []
+        self.rows = []
+        self.first_index = None  # First item index bound to the pool, None forces a rebind
+
+    def pool_size(self):
+        viewport_height = self.scroll_container.relative_rect.height
+        return math.ceil(viewport_height / self.row_stride) + 1 + 2 * self.buffer_rows
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.resize_scroll_area()
+        self.refresh(force=True)
+
+    def extend(self, items):
+        self.items.extend(items)
+        self.resize_scroll_area()
+        self.refresh(force=True)
+
+    def resize_scroll_area(self):
+        content_height = self.row_stride * len(self.items)
+        self.scroll_container.set_scrollable_area_dimensions((self.row_width, max(content_height, self.scroll_container.relative_rect.height)))
+
+    def scroll_offset(self):
+        return -self.scroll_container.get_container().relative_rect.y
+
+    def refresh(self, force=False):
+        """Rebind rows to the items around the scroll position, cheap when nothing moved."""
+        first_index = max(0, self.scroll_offset() // self.row_stride - self.buffer_rows)
+        if first_index == self.first_index and not force:
+            return
+        self.first_index = first_index
+        while len(self.rows) < min(self.pool_size(), len(self.items)):
+            self.rows.append(self.make_row())
+        # Each item keeps the same row while it stays in range, so scrolling only rebinds rows that wrapped
+        for index in range(first_index, first_index + len(self.rows)):
+            row = self.rows[index % len(self.rows)]
+            if index < len(self.items):
+                row.bind(index, self.items[index])
+            else:
+                row.hide()
+
+    def kill(self):
+        for row in self.rows:
+            row.kill()
+        self.rows = []
+        self.items = []
+        self.first_index = None
@@ -0,0 +1,81 @@
+import pygame
+
+# assets
+class AssetManager:
+    """Loads each image once and caches scaled/rotated variants by (path, size, rotation).
+
+    Images are convert()ed to the display format as soon as a display exists, so blits take
+    the fast path. Variants can be packed into shared atlas pages instead of separate surfaces.
+    """
+    def __init__(self, atlas_size=(1024, 1024)):
+        self.images = {}  # path -> converted original
+        self.variants = {}  # (path, size, rotation) -> surface (a subsurface of a page when packed)
+        self.atlas_size = atlas_size
+        self.pages = []  # Atlas surfaces
+        self.shelf = None  # [page index, x, y, shelf height] where the next packed variant goes
+        self.loads = 0  # Images read from disk
+
+    def load(self, path):
+        image = self.images.get(path)
+        if image is None:
+            image = self.convert(pygame.image.load(path))
+            self.loads += 1
+            self.images[path] = image
+        return image
+
+    def convert(self, surface):
+        if pygame.display.get_surface() is None:
+            return surface  # Headless, nothing to convert to
+        if surface.get_flags() & pygame.SRCALPHA or surface.get_colorkey() is not None:
+            return surface.convert_alpha()
+        return surface.convert()
+
+    def get(self, path, size=None, rotation=0, atlas=False):
+        """The image at path scaled to size, then rotated by rotation degrees."""
+        key = (path, tuple(size) if size else None, rotation % 360)
+        surface = self.variants.get(key)
+        if surface is None:
+            surface = self.load(path)
+            if key[1] is not None and key[1] != surface.get_size():
+                surface = pygame.transform.scale(surface, key[1])
+            if key[2]:
+                surface = pygame.transform.rotate(surface, key[2])
+            if atlas:
+                surface = self.pack(surface)
+            self.variants[key] = surface
+        return surface
+
+    def pack(self, surface):
+        """Copy a surface into an atlas page (shelf packing) and return its subsurface."""
+        width, height = surface.get_size()
+        page_width, page_height = self.atlas_size
+        if width > page_width or height > page_height:
+            return surface  # Too big to share a page
+        if self.shelf is None:
+            self.add_page()
+        page_index, x, y, shelf_height = self.shelf
+        if x + width > page_width:
+            # Start the next shelf below the tallest image on this one
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > page_height:
+            page_index = self.add_page()
+            x, y, shelf_height = 0, 0, 0
+        page = self.pages[page_index]
+        page.blit(surface, (x, y), special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto the transparent page
+        self.shelf = [page_index, x + width, y, max(shelf_height, height)]
+        return page.subsurface((x, y, width, height))
+
+    def add_page(self):
+        page = pygame.Surface(self.atlas_size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self.shelf = [len(self.pages) - 1, 0, 0, 0]
+        return len(self.pages) - 1
+
+    def clear(self):
+        self.images.clear()
+        self.variants.clear()
+        self.pages.clear()
+        self.shelf = None
@@ -0,0 +1,50 @@
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Biomes suitable for extreme cold, coldest first:
+# (name, upper temperature bound as an offset from the base temperature, colour)
+BIOME_TABLE = [
+    ('deep_frozen_ocean', 5, (0, 0, 80)),
+    ('frozen_ocean', 10, (0, 20, 150)),
+    ('ice_shelf', 15, (200, 200, 255)),
+    ('glacier', 20, (220, 220, 220)),
+    ('permafrost', 25, (150, 150, 150)),
+    ('polar_desert', 30, (180, 180, 180)),
+    ('snow_fields', None, (255, 255, 255))  # Everything warmer
+]
+
+# classifier
+class BiomeClassifier:
+    """Buckets temperatures into biome indices with a sorted threshold array."""
+    def __init__(self, base_temp, table=BIOME_TABLE):
+        self.names = [name for name, _, _ in table]
+        self.thresholds = [base_temp + offset for _, offset, _ in table if offset is not None]
+        if len(self.thresholds) != len(table) - 1 or self.thresholds != sorted(self.thresholds):
+            raise ValueError("Biome table needs ascending bounds and a final unbounded biome")
+        self.palette = [tuple(color) for _, _, color in table]  # Index -> RGB
+        if np is not None:
+            self.threshold_array = np.array(self.thresholds, dtype=np.float64)
+
+    def classify_one(self, temperature):
+        return bisect_right(self.thresholds, temperature)
+
+    def classify(self, temperatures):
+        """Biome indices (uint8) for a temperature grid of any shape."""
+        if np is not None and not isinstance(temperatures, list):
+            # side="right" matches "temperature < bound" in the original if-chain
+            return np.searchsorted(self.threshold_array, temperatures, side="right").astype(np.uint8)
+        return [[self.classify_one(temperature) for temperature in column] for column in temperatures]
+
+    def name(self, index):
+        return self.names[index]
+
+    def colors(self, indices):
+        """Palette lookup for an index array, shaped like indices plus a trailing RGB axis."""
+        return np.asarray(self.palette, dtype=np.uint8)[indices]
+
+    def set_color(self, name, color):
+        self.palette[self.names.index(name)] = tuple(color)
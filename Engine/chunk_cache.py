@@ -0,0 +1,81 @@
+import sys
+from collections import OrderedDict
+
+# chunk cache
+class ChunkCache:
+    """LRU cache keyed by (chunk_x, chunk_y), bounded by a chunk count and/or a byte budget."""
+    def __init__(self, max_chunks=None, max_bytes=None, sizeof=sys.getsizeof):
+        self.max_chunks = max_chunks  # None means no limit
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof  # Estimates the resident size of one value in bytes
+        self.entries = OrderedDict()  # key -> (value, size), oldest first
+        self.pinned = set()  # Keys that must not be evicted (the current view)
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        """Returns the cached value and marks it as recently used."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        self.discard(key)
+        size = self.sizeof(value)
+        self.entries[key] = (value, size)
+        self.resident_bytes += size
+        self.evict()
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.resident_bytes -= entry[1]
+
+    def pin(self, keys):
+        """Replaces the protected set, then trims anything over budget."""
+        self.pinned = set(keys)
+        self.evict()
+
+    def over_budget(self):
+        return ((self.max_chunks is not None and len(self.entries) > self.max_chunks) or
+                (self.max_bytes is not None and self.resident_bytes > self.max_bytes))
+
+    def evict(self):
+        """Drops least recently used entries until the cache fits its budget."""
+        skipped = 0
+        while self.over_budget() and skipped < len(self.entries):
+            key = next(iter(self.entries))
+            if key in self.pinned:
+                # In view, so it is effectively the most recently used
+                self.entries.move_to_end(key)
+                skipped += 1
+                continue
+            self.discard(key)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.resident_bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "chunks": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "resident_bytes": self.resident_bytes
+        }
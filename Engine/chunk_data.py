@@ -0,0 +1,46 @@
+import sys
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# chunk data
+class ChunkData:
+    """One chunk as a dense row-major (y, x) grid of uint8 biome indices, plus optional float32 temperatures."""
+    __slots__ = ("chunk_x", "chunk_y", "size", "biomes", "temperatures")
+
+    def __init__(self, chunk_x, chunk_y, size, biomes, temperatures=None):
+        self.chunk_x = chunk_x
+        self.chunk_y = chunk_y
+        self.size = size
+        self.biomes = bytes(biomes)  # size * size biome indices
+        self.temperatures = temperatures  # array('f') in the same order, or None
+
+    def index(self, x, y):
+        return y * self.size + x
+
+    def biome_index(self, x, y):
+        return self.biomes[self.index(x, y)]
+
+    def temperature(self, x, y):
+        if self.temperatures is None:
+            return None
+        return self.temperatures[self.index(x, y)]
+
+    def biome_grid(self):
+        """Zero-copy NumPy view of the biome indices, shaped (y, x)."""
+        return np.frombuffer(self.biomes, dtype=np.uint8).reshape(self.size, self.size)
+
+    def nbytes(self):
+        size = sys.getsizeof(self) + sys.getsizeof(self.biomes)
+        if self.temperatures is not None:
+            size += sys.getsizeof(self.temperatures)
+        return size
+
+def pack_temperatures(temperatures, size):
+    """float32 copy of a temperature grid indexed [x][y], in ChunkData's (y, x) order."""
+    if np is not None and not isinstance(temperatures, list):
+        return array("f", np.ascontiguousarray(np.asarray(temperatures, dtype=np.float32).T).tobytes())
+    return array("f", [temperatures[x][y] for y in range(size) for x in range(size)])
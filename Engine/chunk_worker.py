@@ -0,0 +1,86 @@
+import os
+
+from Engine.noise import create_noise, sample_chunk
+
+# worker process
+worker_noise = None  # Built once per worker process by init_worker
+
+def init_worker(octaves, seed, backend):
+    global worker_noise
+    worker_noise = create_noise(octaves=octaves, seed=seed, backend=backend)
+
+def sample_chunk_job(chunk_x, chunk_y, chunk_size, scale):
+    """Runs in a worker process, returns the raw noise values of one chunk."""
+    return sample_chunk(worker_noise, chunk_x, chunk_y, chunk_size, scale)
+
+# generator
+class ChunkGenerator:
+    """Generates chunk noise in a process pool and prefetches ahead of the camera's recent velocity."""
+    def __init__(self, octaves, seed, backend, chunk_size, scale, workers=None, max_pending=None, lookahead=20):
+        self.noise_args = (octaves, seed, backend)
+        self.chunk_size = chunk_size
+        self.scale = scale
+        self.workers = workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or self.workers * 8  # Cap on queued prefetch work
+        self.lookahead = lookahead  # Frames of camera motion to predict ahead
+        self.executor = None
+        self.available = True  # False once the pool failed to start
+        self.pending = {}  # key -> future
+        # camera tracking
+        self.last_position = None
+        self.velocity = (0.0, 0.0)  # Smoothed pixels per frame
+        self.smoothing = 0.3
+
+    def start(self):
+        if self.executor is None and self.available:
+            try:
+                from concurrent.futures import ProcessPoolExecutor  # Imported with the first request, not at startup
+                self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=self.noise_args)
+            except (OSError, NotImplementedError, ImportError) as e:
+                # No multiprocessing support here, Ground generates synchronously instead
+                print(f"Background chunk generation unavailable: {e}")
+                self.available = False
+        return self.executor is not None
+
+    def request(self, key, prefetch=False):
+        """Queues a chunk for generation, returns False if it could not be queued."""
+        if key in self.pending:
+            return True
+        if prefetch and len(self.pending) >= self.max_pending:
+            return False
+        if not self.start():
+            return False
+        # Zoomed out chunks (key[2] = level) sample the noise 2 ** level cells apart
+        scale = self.scale / 2 ** key[2] if len(key) > 2 else self.scale
+        self.pending[key] = self.executor.submit(sample_chunk_job, key[0], key[1], self.chunk_size, scale)
+        return True
+
+    def collect(self, limit):
+        """Returns up to limit finished (key, noise_values) pairs."""
+        finished = []
+        for key, future in list(self.pending.items()):
+            if len(finished) >= limit:
+                break
+            if future.done():
+                del self.pending[key]
+                if future.cancelled() or future.exception() is not None:
+                    continue  # Requested again next time it is in view
+                finished.append((key, future.result()))
+        return finished
+
+    def track(self, camera_x, camera_y):
+        """Updates the smoothed camera velocity and returns the predicted camera position."""
+        if self.last_position is not None:
+            step_x = camera_x - self.last_position[0]
+            step_y = camera_y - self.last_position[1]
+            self.velocity = (self.velocity[0] + (step_x - self.velocity[0]) * self.smoothing,
+                             self.velocity[1] + (step_y - self.velocity[1]) * self.smoothing)
+        self.last_position = (camera_x, camera_y)
+        return (camera_x + self.velocity[0] * self.lookahead,
+                camera_y + self.velocity[1] * self.lookahead)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
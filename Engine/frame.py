@@ -0,0 +1,69 @@
+import pygame
+
+# frame pipeline
+class FramePipeline:
+    """Collects the dirty rectangles reported by each layer and only recomposites and pushes those.
+
+    A layer reports a list of rects, or None when the whole screen changed (camera motion,
+    resize, moving particles). Overlapping rects are merged, the rest stay separate regions,
+    so two small changes at opposite corners never recomposite the area between them. With
+    no dirty rects the frame does no drawing at all.
+    """
+    def __init__(self, full_redraw_ratio=0.5):
+        self.full_redraw_ratio = full_redraw_ratio  # Beyond this share of the screen just redraw everything
+        self.full = True  # The first frame is always drawn in full
+        self.rects = []
+        self.regions = None
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.skipped_frames = 0
+
+    def invalidate(self):
+        self.full = True
+
+    def add(self, rects):
+        if rects is None:
+            self.full = True
+        else:
+            self.rects.extend(pygame.Rect(rect) for rect in rects)
+
+    def merge(self, rects):
+        """Union overlapping rects until none of the results overlap."""
+        merged = []
+        for rect in rects:
+            index = 0
+            while index < len(merged):
+                if rect.colliderect(merged[index]):
+                    rect = rect.union(merged.pop(index))
+                    index = 0  # The grown rect may now overlap one checked before
+                else:
+                    index += 1
+            merged.append(rect)
+        return merged
+
+    def begin(self, screen):
+        """Returns the screen regions to recomposite this frame, or None when nothing changed.
+        Every layer is drawn once per region, clipped to it."""
+        screen_rect = screen.get_rect()
+        if not self.full and self.rects:
+            regions = [rect for rect in self.merge(rect.clip(screen_rect) for rect in self.rects) if rect.width and rect.height]
+            if sum(rect.width * rect.height for rect in regions) > screen_rect.width * screen_rect.height * self.full_redraw_ratio:
+                self.full = True
+            elif regions:
+                self.regions = regions
+        if self.full:
+            self.regions = [screen_rect]
+        return self.regions
+
+    def present(self):
+        if self.full:
+            pygame.display.flip()
+            self.full_frames += 1
+        elif self.regions is not None:
+            pygame.display.update(self.regions)
+            self.partial_frames += 1
+        else:
+            self.skipped_frames += 1
+        self.full = False
+        self.rects = []
+        self.regions = None
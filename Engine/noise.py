@@ -0,0 +1,85 @@
+import random
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, Ground falls back to perlin_noise
+    np = None
+
+from perlin_noise import PerlinNoise
+
+# noise
+class GridNoise:
+    """NumPy port of perlin_noise.PerlinNoise (2D) that samples whole coordinate grids at once."""
+    def __init__(self, octaves=1, seed=None):
+        if np is None:
+            raise ImportError("GridNoise requires NumPy")
+        if octaves <= 0:
+            raise ValueError("octaves expected to be positive number")
+        self.octaves = octaves
+        # Same seeding rule as PerlinNoise so identical parameters give identical worlds
+        self.seed = seed if seed else random.randint(1, 10**5)
+        self.gradients = {}  # lattice hash -> (gx, gy)
+
+    def __call__(self, coordinates):
+        """Scalar call, compatible with PerlinNoise([x, y])."""
+        x, y = coordinates
+        return float(self.grid(np.array([x], dtype=np.float64), np.array([y], dtype=np.float64))[0])
+
+    def get_gradients(self, hashes):
+        """Look up (and lazily create) the gradient vectors for an array of lattice hashes."""
+        unique, inverse = np.unique(hashes, return_inverse=True)
+        table = np.empty((len(unique), 2), dtype=np.float64)
+        for i, lattice_hash in enumerate(unique.tolist()):
+            vec = self.gradients.get(lattice_hash)
+            if vec is None:
+                # Mirrors perlin_noise.tools.sample_vector without touching the global random state
+                rng = random.Random(self.seed * lattice_hash)
+                vec = (rng.uniform(-1, 1), rng.uniform(-1, 1))
+                self.gradients[lattice_hash] = vec
+            table[i] = vec
+        table = table[inverse.reshape(-1)]
+        return table[:, 0].reshape(hashes.shape), table[:, 1].reshape(hashes.shape)
+
+    def grid(self, xs, ys):
+        """Evaluate noise for broadcastable coordinate arrays xs, ys."""
+        xs, ys = np.broadcast_arrays(np.asarray(xs, dtype=np.float64) * self.octaves,
+                                     np.asarray(ys, dtype=np.float64) * self.octaves)
+        x0 = np.floor(xs)
+        y0 = np.floor(ys)
+        total = np.zeros(xs.shape, dtype=np.float64)
+        # Corner order matches itertools.product over the bounding box in PerlinNoise.noise
+        for corner_x, corner_y in ((x0, y0), (x0, y0 + 1), (x0 + 1, y0), (x0 + 1, y0 + 1)):
+            dist_x = xs - corner_x
+            dist_y = ys - corner_y
+            # perlin_noise.tools.hasher for two dimensions: |x + 10 * y + 1|, at least 1
+            hashes = np.maximum(1, np.abs(corner_x.astype(np.int64) + 10 * corner_y.astype(np.int64) + 1))
+            grad_x, grad_y = self.get_gradients(hashes)
+            weight = fade(1 - np.abs(dist_x)) * fade(1 - np.abs(dist_y))
+            total += weight * (grad_x * dist_x + grad_y * dist_y)
+        return total
+
+def fade(value):
+    """Quintic smoothing used by perlin_noise."""
+    return 6 * value ** 5 - 15 * value ** 4 + 10 * value ** 3
+
+def create_noise(octaves, seed, backend="auto"):
+    """Returns a GridNoise when NumPy is available (or requested), otherwise a PerlinNoise."""
+    if backend == "numpy" or (backend == "auto" and np is not None):
+        return GridNoise(octaves=octaves, seed=seed)
+    if backend not in ("auto", "perlin"):
+        raise ValueError(f"Unknown noise backend: {backend}")
+    return PerlinNoise(octaves=octaves, seed=seed)
+
+def sample_chunk(noise, chunk_x, chunk_y, chunk_size, scale):
+    """Noise values for every cell of a chunk, indexed [x][y] in cell order."""
+    return sample_area(noise, chunk_x * chunk_size, chunk_y * chunk_size, chunk_size, chunk_size, scale)
+
+def sample_area(noise, start_x, start_y, width, height, scale):
+    """Noise values for a width x height block of cells starting at cell (start_x, start_y), indexed [x][y]."""
+    if isinstance(noise, GridNoise):
+        xs = (start_x + np.arange(width, dtype=np.float64)) / scale
+        ys = (start_y + np.arange(height, dtype=np.float64)) / scale
+        return noise.grid(xs[:, None], ys[None, :])
+    # Pure Python fallback, one call per cell
+    return [[noise([(start_x + x) / scale, (start_y + y) / scale]) for y in range(height)]
+            for x in range(width)]
@@ -0,0 +1,53 @@
+import pygame
+
+# "alpha": per-pixel alpha surface (original look, SIMD blit on pygame-ce)
+# "surface_alpha": opaque surface with surface-level alpha, same look, no per-pixel alpha
+# "multiply": BLEND_MULT tint, cheapest, but can only darken
+OVERLAY_MODES = ("alpha", "surface_alpha", "multiply")
+
+# overlays
+class OverlayCache:
+    """Full-screen colour overlays built once per (screen size, RGBA) instead of every frame."""
+    def __init__(self, mode="alpha"):
+        if mode not in OVERLAY_MODES:
+            raise ValueError(f"Unknown overlay mode: {mode}")
+        self.mode = mode
+        self.size = None
+        self.surfaces = {}  # rgba -> surface for the current size
+
+    def get(self, size, rgba):
+        if size != self.size:
+            # Window was resized, the old overlays are useless
+            self.surfaces.clear()
+            self.size = size
+        surface = self.surfaces.get(rgba)
+        if surface is None:
+            surface = self.build(size, rgba)
+            self.surfaces[rgba] = surface
+        return surface
+
+    def build(self, size, rgba):
+        red, green, blue, alpha = rgba
+        converted = pygame.display.get_surface() is not None
+        if self.mode == "alpha":
+            surface = pygame.Surface(size, pygame.SRCALPHA)
+            surface.fill(rgba)
+            return surface.convert_alpha() if converted else surface
+        surface = pygame.Surface(size)
+        if converted:
+            surface = surface.convert()
+        if self.mode == "surface_alpha":
+            surface.fill((red, green, blue))
+            surface.set_alpha(alpha)
+        else:
+            # Multiplying by this colour approximates blending the overlay at the given alpha
+            keep = 255 - alpha
+            surface.fill(tuple((channel * alpha + 255 * keep) // 255 for channel in (red, green, blue)))
+        return surface
+
+    def blit(self, screen, rgba):
+        surface = self.get(screen.get_size(), rgba)
+        if self.mode == "multiply":
+            screen.blit(surface, (0, 0), special_flags=pygame.BLEND_MULT)
+        else:
+            screen.blit(surface, (0, 0))
@@ -0,0 +1,88 @@
+import math
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError:  # Weather falls back to scattering particles each frame
+    np = None
+
+# Where each wind direction pushes particles (wind is named after where it blows from)
+WIND_VECTORS = {
+    "North": (0.0, 1.0),
+    "North-East": (-math.sqrt(0.5), math.sqrt(0.5)),
+    "East": (-1.0, 0.0),
+    "South-East": (-math.sqrt(0.5), -math.sqrt(0.5)),
+    "South": (0.0, -1.0),
+    "South-West": (math.sqrt(0.5), -math.sqrt(0.5)),
+    "West": (1.0, 0.0),
+    "North-West": (math.sqrt(0.5), math.sqrt(0.5))
+}
+
+# Per weather type: pool size, sprite shapes, fall speed range (px/s) and how strongly wind moves them
+PARTICLE_STYLES = {
+    "snowstorm": {"count": 1500, "shape": "dot", "color": (220, 240, 255), "sizes": (1, 2, 3), "speed": (60, 160), "wind": 8.0},
+    "nitrogen snow": {"count": 1000, "shape": "dot", "color": (200, 225, 255), "sizes": (1, 2), "speed": (40, 100), "wind": 5.0},
+    "methane rain": {"count": 800, "shape": "streak", "color": (100, 150, 220), "sizes": (8, 10, 12), "speed": (420, 620), "wind": 3.0},
+    "fog": {"count": 150, "shape": "puff", "color": (200, 200, 240, 60), "sizes": (4, 6, 8), "speed": (4, 12), "wind": 2.0}
+}
+
+def make_sprite(shape, color, size):
+    """Pre-render one particle sprite."""
+    if shape == "streak":
+        sprite = pygame.Surface((2, size), pygame.SRCALPHA)
+        sprite.fill(color)
+    else:
+        sprite = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (size, size), size if shape == "puff" else max(1, size // 2))
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()
+    return sprite
+
+# particles
+class ParticleField:
+    """Fixed pool of particles for one weather type, moved in bulk with NumPy and drawn with one blits call."""
+    def __init__(self, style, screen_size, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = style["count"]
+        self.wind_factor = style["wind"]
+        self.sprites = [make_sprite(style["shape"], style["color"], size) for size in style["sizes"]]
+        self.margin = max(max(sprite.get_size()) for sprite in self.sprites)
+        self.width, self.height = screen_size
+        # state
+        self.positions = np.column_stack((self.rng.uniform(-self.margin, self.width + self.margin, self.count),
+                                          self.rng.uniform(-self.margin, self.height + self.margin, self.count)))
+        self.velocities = np.column_stack((self.rng.uniform(-10, 10, self.count),
+                                           self.rng.uniform(*style["speed"], self.count)))
+        self.sprite_indices = self.rng.integers(0, len(self.sprites), self.count).tolist()
+        # A particle only shows where the weather's intensity is above its level, see draw(mask)
+        self.levels = self.rng.random(self.count)
+
+    def resize(self, screen_size):
+        width, height = screen_size
+        if (width, height) != (self.width, self.height):
+            self.positions *= (width / self.width, height / self.height)
+            self.width, self.height = width, height
+
+    def update(self, dt, wind_speed, wind_direction):
+        """Advance every particle by dt seconds, wrapping those that leave the screen."""
+        wind_x, wind_y = WIND_VECTORS.get(wind_direction, (0.0, 0.0))
+        push = wind_speed * self.wind_factor * dt
+        self.positions += self.velocities * dt
+        self.positions += (wind_x * push, wind_y * push)
+        # Particles that leave re-enter on the opposite edge, so the pool never changes size
+        span = (self.width + 2 * self.margin, self.height + 2 * self.margin)
+        np.mod(self.positions + self.margin, span, out=self.positions)
+        self.positions -= self.margin
+
+    def draw(self, screen, mask=None):
+        """Draw every particle, or only those where the boolean array mask is set."""
+        sprites = self.sprites
+        positions = self.positions.astype(np.int32)
+        if mask is None:
+            screen.blits([(sprites[index], position) for index, position in
+                          zip(self.sprite_indices, positions.tolist())], doreturn=False)
+            return
+        shown = np.flatnonzero(mask)
+        screen.blits([(sprites[self.sprite_indices[particle]], position) for particle, position in
+                      zip(shown.tolist(), positions[shown].tolist())], doreturn=False)
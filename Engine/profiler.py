@@ -0,0 +1,167 @@
+import os
+import time
+import pygame
+
+# Stages of App.run in the order they are marked
+FRAME_STAGES = ("events", "update", "ui_update", "compose", "ground", "weather", "cards", "draw_ui", "overlay", "flip")
+
+# profiler
+class FrameProfiler:
+    """Per-stage frame timings kept in a ring buffer, with an on-screen overlay and CSV export.
+
+    Call begin_frame() once per frame, mark(stage) at the end of every stage and end_frame()
+    when the frame is done; mark() charges the time since the previous mark to the stage.
+    While disabled every call returns straight away.
+    """
+    def __init__(self, stages=FRAME_STAGES, capacity=600, enabled=False, refresh_interval=0.5):
+        self.stages = tuple(stages)
+        self.capacity = capacity
+        self.enabled = enabled
+        self.refresh_interval = refresh_interval
+        self.samples = {stage: [0.0] * capacity for stage in self.stages}  # Ring buffers, seconds
+        self.totals = [0.0] * capacity
+        self.count = 0  # Frames recorded, the ring slot is count % capacity
+        self.current = dict.fromkeys(self.stages, 0.0)
+        self.frame_start = 0.0
+        self.last_mark = 0.0
+        # overlay
+        self.font = None
+        self.surface = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.rendered_at = 0.0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.surface = None
+        return self.enabled
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.frame_start = self.last_mark = time.perf_counter()
+        for stage in self.stages:
+            self.current[stage] = 0.0
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.current[stage] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        slot = self.count % self.capacity
+        for stage in self.stages:
+            self.samples[stage][slot] = self.current[stage]
+        self.totals[slot] = time.perf_counter() - self.frame_start
+        self.count += 1
+
+    def recorded(self):
+        return min(self.count, self.capacity)
+
+    def ordered(self, ring):
+        """Ring buffer contents from oldest to newest."""
+        if self.count <= self.capacity:
+            return ring[:self.count]
+        slot = self.count % self.capacity
+        return ring[slot:] + ring[:slot]
+
+    def summary(self):
+        """Average and p99 in milliseconds for every stage and the whole frame."""
+        summary = {}
+        recorded = self.recorded()
+        for name, ring in list(self.samples.items()) + [("frame", self.totals)]:
+            values = sorted(ring[:recorded])
+            if not values:
+                summary[name] = (0.0, 0.0)
+                continue
+            p99 = values[min(len(values) - 1, int(0.99 * len(values)))]
+            summary[name] = (sum(values) / len(values) * 1000, p99 * 1000)
+        return summary
+
+    def export_csv(self, path):
+        """Write the recorded frames, oldest first, one row per frame in milliseconds."""
+        import csv  # Only needed when exporting, kept off the startup path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        columns = [self.ordered(self.samples[stage]) for stage in self.stages] + [self.ordered(self.totals)]
+        first_frame = self.count - self.recorded()
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["frame"] + [f"{stage}_ms" for stage in self.stages] + ["frame_ms"])
+            for index, row in enumerate(zip(*columns)):
+                writer.writerow([first_frame + index] + [f"{value * 1000:.4f}" for value in row])
+        print(f"Frame timings saved to {path}")
+        return path
+
+    # overlay
+    def render(self, screen, lines):
+        if self.font is None:
+            self.font = pygame.font.SysFont("consolas,dejavusansmono,couriernew,monospace", 14)
+        line_height = self.font.get_linesize()
+        rendered = [self.font.render(line, True, (230, 230, 230)) for line in lines]
+        width = max(text.get_width() for text in rendered) + 16
+        self.surface = pygame.Surface((width, line_height * len(rendered) + 12), pygame.SRCALPHA)
+        self.surface.fill((0, 0, 0, 170))
+        for index, text in enumerate(rendered):
+            self.surface.blit(text, (8, 6 + index * line_height))
+        # Bottom left corner, clear of the details panel and the cards
+        self.rect = self.surface.get_rect(bottomleft=(10, screen.get_height() - 10))
+
+    def update(self, screen, cache_stats=None, frame=None):
+        """Re-render the overlay text every refresh_interval seconds. Returns the rects to redraw."""
+        if not self.enabled:
+            return []
+        now = time.perf_counter()
+        if self.surface is not None and now - self.rendered_at < self.refresh_interval:
+            return [self.rect]
+        previous = self.rect
+        self.render(screen, self.get_lines(cache_stats, frame))
+        self.rendered_at = now
+        return [previous, self.rect]
+
+    def draw(self, screen):
+        if self.enabled and self.surface is not None:
+            screen.blit(self.surface, self.rect)
+
+    def get_lines(self, cache_stats=None, frame=None):
+        lines = [f"{'stage':<10}{'avg ms':>9}{'p99 ms':>9}   ({self.recorded()} frames)"]
+        for name, (average, p99) in self.summary().items():
+            lines.append(f"{name:<10}{average:>9.3f}{p99:>9.3f}")
+        if cache_stats:
+            for name, stats in cache_stats.items():
+                lines.append(f"{name:<10}{stats['chunks']} resident, {stats['hit_rate'] * 100:.1f}% hits, {stats['evictions']} evicted, {stats['resident_bytes'] // 1024} KB")
+        if frame is not None:
+            lines.append(f"{'frames':<10}{frame.full_frames} full, {frame.partial_frames} partial, {frame.skipped_frames} skipped")
+        return lines
+
+# startup
+class StartupTimer:
+    """Time spent in each startup phase, up to the first presented frame."""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []  # (name, seconds)
+        self.finished = False
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def finish(self, phase="first_frame"):
+        """Mark the last phase, print the report and return it."""
+        if self.finished:
+            return None
+        self.mark(phase)
+        self.finished = True
+        report = self.get_report()
+        print("Startup: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in report["phases_ms"].items()) + f" | first frame after {report['total_ms']:.0f} ms")
+        return report
+
+    def get_report(self):
+        return {
+            "phases_ms": {name: round(seconds * 1000, 2) for name, seconds in self.phases},
+            "total_ms": round((self.last - self.start) * 1000, 2)
+        }
@@ -0,0 +1,64 @@
+import pygame
+
+# spatial hash
+class SpatialHash:
+    """Buckets rects into a uniform grid, so point and rect queries only test nearby items."""
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.buckets = {}  # (cell_x, cell_y) -> set of items
+        self.items = {}  # item -> (rect, cells)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def get_cells(self, rect):
+        size = self.cell_size
+        return [(cell_x, cell_y)
+                for cell_x in range(rect.left // size, (rect.right - 1) // size + 1)
+                for cell_y in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def insert(self, item, rect):
+        """Add an item, or move it if it is already in the hash."""
+        rect = pygame.Rect(rect)
+        cells = self.get_cells(rect)
+        entry = self.items.get(item)
+        if entry is not None:
+            if entry[1] == cells:
+                self.items[item] = (rect, cells)  # Same buckets, only the rect changed
+                return
+            self.remove(item)
+        for cell in cells:
+            self.buckets.setdefault(cell, set()).add(item)
+        self.items[item] = (rect, cells)
+
+    def remove(self, item):
+        entry = self.items.pop(item, None)
+        if entry is None:
+            return False
+        for cell in entry[1]:
+            bucket = self.buckets[cell]
+            bucket.discard(item)
+            if not bucket:
+                del self.buckets[cell]
+        return True
+
+    def query_point(self, pos):
+        """Items whose rect contains pos."""
+        x, y = pos
+        bucket = self.buckets.get((int(x) // self.cell_size, int(y) // self.cell_size), ())
+        return [item for item in bucket if self.items[item][0].collidepoint(x, y)]
+
+    def query_rect(self, rect):
+        """Items whose rect overlaps rect."""
+        rect = pygame.Rect(rect)
+        found = set()
+        for cell in self.get_cells(rect):
+            found.update(self.buckets.get(cell, ()))
+        return [item for item in found if self.items[item][0].colliderect(rect)]
+
+    def clear(self):
+        self.buckets.clear()
+        self.items.clear()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+TILE_STORE_VERSION = 1
+HEADER = struct.Struct("<8sII16s")  # magic, version, tile size in bytes, parameter digest
+INDEX_RECORD = struct.Struct("<iiI")  # chunk_x, chunk_y, slot
+MAGIC = b"SDTILES\0"
+GROW_TILES = 1024  # Data file grows by this many slots at a time
+
+# tile store
+class TileStore:
+    """Memory-mapped on-disk store of biome-index tiles for one set of generation parameters.
+
+    Tiles live in <digest>.tiles as fixed-size slots after a header; <digest>.index is an
+    append-only list of (chunk_x, chunk_y, slot) records. The digest covers the seed, noise
+    and biome parameters and TILE_STORE_VERSION, so changing any of them starts a new store
+    and removes the files of the old one.
+    """
+    def __init__(self, directory, params, tile_bytes):
+        self.directory = directory
+        self.params = dict(params, store_version=TILE_STORE_VERSION)
+        self.tile_bytes = tile_bytes
+        self.digest = hashlib.sha1(json.dumps(self.params, sort_keys=True).encode("utf-8")).digest()[:16]
+        name = self.digest.hex()
+        self.data_path = os.path.join(directory, f"{name}.tiles")
+        self.index_path = os.path.join(directory, f"{name}.index")
+        self.slots = {}  # (chunk_x, chunk_y) -> slot
+        self.capacity = 0
+        self.data_file = None
+        self.data_map = None
+        self.index_file = None
+        self.open()
+
+    def open(self):
+        os.makedirs(self.directory, exist_ok=True)
+        self.remove_stale()
+        header = HEADER.pack(MAGIC, TILE_STORE_VERSION, self.tile_bytes, self.digest)
+        if not self.header_matches(header):
+            self.reset(header)
+        self.data_file = open(self.data_path, "r+b")
+        self.capacity = (os.path.getsize(self.data_path) - HEADER.size) // self.tile_bytes
+        self.data_map = mmap.mmap(self.data_file.fileno(), 0)
+        self.load_index()
+        self.index_file = open(self.index_path, "ab")
+
+    def header_matches(self, header):
+        try:
+            with open(self.data_path, "rb") as file:
+                return file.read(HEADER.size) == header and os.path.exists(self.index_path)
+        except FileNotFoundError:
+            return False
+
+    def remove_stale(self):
+        """Delete store files left by other parameters, they can never be read again."""
+        keep = {os.path.basename(self.data_path), os.path.basename(self.index_path)}
+        for name in os.listdir(self.directory):
+            digest, extension = os.path.splitext(name)
+            if extension not in (".tiles", ".index") or name in keep or len(digest) != 32:
+                continue
+            try:
+                bytes.fromhex(digest)
+                os.remove(os.path.join(self.directory, name))
+            except (ValueError, OSError):
+                pass  # Not one of ours, or still in use elsewhere
+
+    def reset(self, header):
+        """Start an empty store (missing files, old version or different parameters)."""
+        with open(self.data_path, "wb") as file:
+            file.write(header)
+            file.truncate(HEADER.size + GROW_TILES * self.tile_bytes)
+        open(self.index_path, "wb").close()
+
+    def load_index(self):
+        with open(self.index_path, "rb") as file:
+            data = file.read()
+        # A torn final record from a crash is dropped
+        usable = len(data) - len(data) % INDEX_RECORD.size
+        for chunk_x, chunk_y, slot in INDEX_RECORD.iter_unpack(data[:usable]):
+            if slot < self.capacity:
+                self.slots[(chunk_x, chunk_y)] = slot
+        if usable != len(data):
+            with open(self.index_path, "r+b") as file:
+                file.truncate(usable)
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def get(self, chunk_x, chunk_y):
+        """Tile bytes for a chunk, or None when it has not been stored."""
+        slot = self.slots.get((chunk_x, chunk_y))
+        if slot is None:
+            return None
+        start = HEADER.size + slot * self.tile_bytes
+        return self.data_map[start:start + self.tile_bytes]
+
+    def put(self, chunk_x, chunk_y, tile):
+        if (chunk_x, chunk_y) in self.slots or self.data_map is None:
+            return
+        if len(tile) != self.tile_bytes:
+            raise ValueError(f"Tile must be {self.tile_bytes} bytes, got {len(tile)}")
+        slot = len(self.slots)
+        if slot >= self.capacity:
+            self.grow()
+        start = HEADER.size + slot * self.tile_bytes
+        self.data_map[start:start + self.tile_bytes] = tile
+        # The tile is written before its index record, so a crash never indexes garbage
+        self.index_file.write(INDEX_RECORD.pack(chunk_x, chunk_y, slot))
+        self.slots[(chunk_x, chunk_y)] = slot
+
+    def grow(self):
+        self.data_map.close()
+        self.capacity += GROW_TILES
+        self.data_file.truncate(HEADER.size + self.capacity * self.tile_bytes)
+        self.data_map = mmap.mmap(self.data_file.fileno(), 0)
+
+    def flush(self):
+        if self.data_map is not None:
+            self.data_map.flush()
+            self.index_file.flush()
+
+    def close(self):
+        if self.data_map is not None:
+            self.flush()
+            self.data_map.close()
+            self.data_file.close()
+            self.index_file.close()
+            self.data_map = None
@@ -0,0 +1,100 @@
+import bisect
+import math
+
+try:
+    import numpy as np
+except ImportError:  # Samples are computed one noise call at a time
+    np = None
+
+from Engine.noise import GridNoise, create_noise
+from Engine.weather_sim import WEATHER_TYPES
+
+# Regional weather types from low to high field values, neighbouring regions blend into each other
+REGION_TYPES = ("methane rain", "fog", "overcast", "clear", "snowstorm", "nitrogen snow")
+# Field value bounds between REGION_TYPES, roughly equal areas for 2-octave noise
+REGION_THRESHOLDS = (-0.17, -0.07, 0.0, 0.07, 0.17)
+
+# weather field
+class WeatherField:
+    """Weather that varies across the map, sampled on a coarse grid and drifting over time.
+
+    Grid point (i, j) sits at world pixel (i * spacing, j * spacing). Each point has a field
+    value, the weather type it falls in (index into WEATHER_TYPES) and an intensity in [0, 1].
+    Whole grids come from one vectorized noise call per field, and positions in between are
+    interpolated.
+    """
+    def __init__(self, seed, spacing=160, scale=300.0, drift=(0.001, 0.0004), octaves=2, update_interval=0.5, hysteresis=0.01):
+        self.spacing = spacing  # World pixels between grid points (one chunk by default)
+        self.scale = scale  # Grid points per noise unit, bigger means larger regions
+        self.drift = drift  # Noise units per second, moves the regions across the map
+        self.update_interval = update_interval  # Grids are reused for this many seconds
+        self.hysteresis = hysteresis  # How far past a threshold the field must go to leave the current type
+        self.type_noise = create_noise(octaves=octaves, seed=seed)
+        self.intensity_noise = create_noise(octaves=octaves, seed=seed + 1)
+        self.type_indices = [WEATHER_TYPES.index(name) for name in REGION_TYPES]
+        self.grids = {}  # (first_x, first_y, columns, rows, step) -> grid, for the current tick only
+        self.grids_tick = None
+
+    def get_tick(self, now):
+        return math.floor(now / self.update_interval)
+
+    def sample_grid(self, first_x, first_y, columns, rows, now, step=1):
+        """(weather, intensity, value) for grid points first_x.. and first_y.. every step points, indexed [x][y].
+
+        NumPy arrays (uint8 and float) when available, otherwise lists of lists.
+        """
+        tick = self.get_tick(now)
+        if tick != self.grids_tick:
+            self.grids.clear()  # The regions moved on
+            self.grids_tick = tick
+        key = (first_x, first_y, columns, rows, step)
+        grid = self.grids.get(key)
+        if grid is not None:
+            return grid
+        t = tick * self.update_interval
+        if isinstance(self.type_noise, GridNoise):
+            xs = ((first_x + np.arange(columns) * step) / self.scale + self.drift[0] * t)[:, None]
+            ys = ((first_y + np.arange(rows) * step) / self.scale + self.drift[1] * t)[None, :]
+            values = self.type_noise.grid(xs, ys)
+            types = np.asarray(self.type_indices, dtype=np.uint8)[np.searchsorted(REGION_THRESHOLDS, values, side="right")]
+            intensity = np.clip(0.5 + self.intensity_noise.grid(xs, ys) * 2.5, 0.0, 1.0)
+            grid = (types, intensity, values)
+        else:
+            values = [[self.sample_value(first_x + i * step, first_y + j * step, t) for j in range(rows)] for i in range(columns)]
+            grid = ([[self.get_type(value) for value in column] for column in values],
+                    [[self.sample_intensity(first_x + i * step, first_y + j * step, t) for j in range(rows)] for i in range(columns)],
+                    values)
+        self.grids[key] = grid
+        return grid
+
+    def get_noise_position(self, grid_x, grid_y, t):
+        return [grid_x / self.scale + self.drift[0] * t, grid_y / self.scale + self.drift[1] * t]
+
+    def sample_value(self, grid_x, grid_y, t):
+        return self.type_noise(self.get_noise_position(grid_x, grid_y, t))
+
+    def get_type(self, value):
+        return self.type_indices[bisect.bisect_right(REGION_THRESHOLDS, value)]
+
+    def sample_intensity(self, grid_x, grid_y, t):
+        return min(1.0, max(0.0, 0.5 + self.intensity_noise(self.get_noise_position(grid_x, grid_y, t)) * 2.5))
+
+    def at(self, world_x, world_y, now, current=None):
+        """Local conditions at a world pixel, the field value and intensity interpolated between the
+        four grid points around it. The current weather is kept until the field is hysteresis past
+        its thresholds, so standing on a border does not flip between two types."""
+        grid_x, grid_y = world_x / self.spacing, world_y / self.spacing
+        first_x, first_y = math.floor(grid_x), math.floor(grid_y)
+        types, intensity, values = self.sample_grid(first_x, first_y, 2, 2, now)
+        fraction_x, fraction_y = grid_x - first_x, grid_y - first_y
+        weights = ((0, 0, (1 - fraction_x) * (1 - fraction_y)), (1, 0, fraction_x * (1 - fraction_y)),
+                   (0, 1, (1 - fraction_x) * fraction_y), (1, 1, fraction_x * fraction_y))
+        value = sum(float(values[x][y]) * weight for x, y, weight in weights)
+        weather = WEATHER_TYPES[self.get_type(value)]
+        if current in REGION_TYPES and weather != current:
+            band = REGION_TYPES.index(current)
+            low = REGION_THRESHOLDS[band - 1] - self.hysteresis if band else -math.inf
+            high = REGION_THRESHOLDS[band] + self.hysteresis if band < len(REGION_THRESHOLDS) else math.inf
+            if low <= value < high:
+                weather = current
+        return {"weather": weather, "intensity": sum(float(intensity[x][y]) * weight for x, y, weight in weights)}
@@ -0,0 +1,170 @@
+import json
+import os
+import struct
+import zlib
+
+MAGIC = b"SDWLOG1\n"
+RECORD_HEADER = struct.Struct("<II")  # payload length, crc32 of payload
+
+# weather log
+class WeatherLog:
+    """Append-only weather history: length-prefixed, checksummed JSON records.
+
+    Appends are O(1). On first use, a torn or corrupt tail left by a crash is truncated away.
+    """
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path
+        self.count = 0
+        self.end = len(MAGIC)  # Offset just past the last valid record
+        self.last = None  # Offset of the last valid record
+        self.generation = 0  # Bumped whenever the log is cleared, invalidating cursors
+        self.opened = False  # The recovery scan runs on first use, not when the log is created
+
+    def __len__(self):
+        self.open()
+        return self.count
+
+    def open(self):
+        """Check the whole log (and import the legacy pickle) once, before the first read or write."""
+        if self.opened:
+            return
+        self.opened = True
+        self.recover()
+        if self.legacy_path is not None:
+            self.migrate(self.legacy_path)
+
+    def recover(self):
+        """Create the file if needed and drop anything after the last valid record."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.path) or os.path.getsize(self.path) < len(MAGIC):
+            with open(self.path, "wb") as file:
+                file.write(MAGIC)
+        self.count = 0
+        self.end = len(MAGIC)
+        self.last = None
+        # Checksums only, records are not decoded until something reads them
+        for _, end in self.iter_records(len(MAGIC), decode=False):
+            self.count += 1
+            self.last = self.end
+            self.end = end
+        if os.path.getsize(self.path) != self.end:
+            print(f"Recovered '{self.path}': dropped a partial record after {self.count} records")
+            with open(self.path, "r+b") as file:
+                file.truncate(self.end)
+
+    def iter_records(self, offset, decode=True):
+        """Yields (record, end_offset) for every valid record from offset on (record is None without decode)."""
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            while True:
+                header = file.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                length, checksum = RECORD_HEADER.unpack(header)
+                payload = file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset += RECORD_HEADER.size + length
+                yield (json.loads(payload.decode("utf-8")) if decode else None), offset
+
+    def encode(self, record):
+        payload = json.dumps(record).encode("utf-8")
+        return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+    def append(self, record):
+        self.open()
+        data = self.encode(record)
+        with open(self.path, "ab") as file:
+            file.write(data)
+        self.count += 1
+        self.last = self.end
+        self.end += len(data)
+
+    def rewrite(self, records):
+        """Replace the whole log with records, atomically."""
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(MAGIC)
+            for record in records:
+                file.write(self.encode(record))
+        os.replace(temporary_path, self.path)
+        self.generation += 1
+        self.recover()
+
+    def read_all(self):
+        self.open()
+        return [record for record, _ in self.iter_records(len(MAGIC))]
+
+    def read_last(self):
+        """The newest record without decoding the rest of the log, or None if it is empty."""
+        self.open()
+        if self.last is None:
+            return None
+        for record, _ in self.iter_records(self.last):
+            return record
+        return None
+
+    def clear(self):
+        self.open()
+        with open(self.path, "wb") as file:
+            file.write(MAGIC)
+        self.count = 0
+        self.end = len(MAGIC)
+        self.last = None
+        self.generation += 1
+
+    # cursors: (generation, offset) of the first record a reader has not seen yet
+    def changed_since(self, cursor):
+        """Cheap check (one stat call) for whether read_since would return anything new."""
+        if cursor is None or cursor[0] != self.generation:
+            return True
+        try:
+            return os.stat(self.path).st_size != cursor[1]
+        except FileNotFoundError:
+            return True
+
+    def read_since(self, cursor):
+        """Returns (records, new_cursor, reset). reset means the log was cleared or
+        rewritten since cursor, and records holds the whole history again."""
+        self.open()
+        reset = cursor is None or cursor[0] != self.generation
+        offset = len(MAGIC) if reset else cursor[1]
+        try:
+            if os.stat(self.path).st_size < offset:
+                reset, offset = True, len(MAGIC)
+        except FileNotFoundError:
+            self.recover()
+            reset, offset = True, len(MAGIC)
+        records = []
+        for record, end in self.iter_records(offset):
+            records.append(record)
+            offset = end
+        return records, (self.generation, offset), reset
+
+    def migrate(self, legacy_path):
+        """Import an old pickled list of reports once, then rename the pickle out of the way.
+        A pickle that cannot be imported is left where it is."""
+        if not os.path.exists(legacy_path):
+            return
+        import pickle  # Only needed for this one-off import
+        try:
+            with open(legacy_path, "rb") as file:
+                records = pickle.load(file) or []
+            if not isinstance(records, list):
+                raise ValueError(f"expected a list of reports, got {type(records).__name__}")
+            for record in records:
+                self.encode(record)  # Fails before anything is written if a record is not JSON
+        except Exception as e:  # Unpickling can raise almost anything for a damaged or foreign file
+            print(f"Could not migrate '{legacy_path}', left in place: {e}")
+            return
+        if self.count == 0:
+            for record in records:
+                self.append(record)
+        elif records:
+            # The log was started before the pickle was imported, the pickled records are older
+            self.rewrite(records + self.read_all())
+        os.replace(legacy_path, legacy_path + ".migrated")
+        print(f"Migrated {len(records)} records from '{legacy_path}'")
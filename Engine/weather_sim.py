@@ -0,0 +1,167 @@
+import bisect
+import math
+import random
+
+try:
+    import numpy as np
+except ImportError:  # Timelines are simulated one step at a time into lists
+    np = None
+
+WEATHER_TYPES = ["clear", "overcast", "snowstorm", "fog", "methane rain", "nitrogen snow"]
+WIND_DIRECTIONS = ["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"]
+# weather type -> (precipitation, visibility range)
+PRECIPITATION = {
+    "methane rain": ("liquid methane", (5, 20)),
+    "nitrogen snow": ("solid nitrogen", (2, 10)),
+    "snowstorm": ("hydrogen ice crystals", (1, 5)),
+    "fog": ("helium mist", (3, 8)),
+}
+NO_PRECIPITATION = ("none", (20, 100))
+BASE_TEMPERATURE = -272.5
+TEMPERATURE_VARIATION = 1.5
+WIND_SPEED_RANGE = (5, 30)
+PRESSURE_RANGE = (0.01, 0.05)
+FIRST_CHANGE = (10, 30)  # Seconds until the first weather change, inclusive
+CHANGE_INTERVAL = (15, 45)  # Seconds between later changes, inclusive
+COLUMNS = ("time", "weather", "temperature", "wind_speed", "wind_direction", "feels_like", "pressure", "visibility")
+
+def get_feels_like(temperature, wind_speed):
+    return round(max(temperature - (wind_speed / 20), -273.15), 2)
+
+def roll_weather_values(rng, weather_type):
+    """One set of values for a weather type, drawn from a random.Random (or the random module)."""
+    temperature = round(rng.uniform(BASE_TEMPERATURE - TEMPERATURE_VARIATION, BASE_TEMPERATURE + TEMPERATURE_VARIATION), 2)
+    wind_speed = round(rng.uniform(*WIND_SPEED_RANGE), 2)
+    wind_direction = rng.choice(WIND_DIRECTIONS)
+    pressure = round(rng.uniform(*PRESSURE_RANGE), 3)
+    precipitation, visibility_range = PRECIPITATION.get(weather_type, NO_PRECIPITATION)
+    return {
+        "weather": weather_type,
+        "temperature": temperature,
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "feels_like": get_feels_like(temperature, wind_speed),
+        "pressure": pressure,
+        "visibility": round(rng.uniform(*visibility_range), 1),
+        "precipitation": precipitation
+    }
+
+# timeline
+class WeatherTimeline:
+    """Columnar record of simulated weather changes, one row per change.
+
+    columns["time"] holds the seconds after the start at which each row takes effect; weather
+    and wind_direction are indices into WEATHER_TYPES and WIND_DIRECTIONS. With NumPy every
+    column is an array, otherwise a list.
+    """
+    def __init__(self, columns, seed, day_length):
+        self.columns = columns
+        self.seed = seed
+        self.day_length = day_length
+
+    def __len__(self):
+        return len(self.columns["time"])
+
+    def duration(self):
+        return self.columns["time"][-1] if len(self) else 0
+
+    def index_at(self, elapsed):
+        """Row in effect elapsed seconds after the start (the last row once past the end)."""
+        if np is not None:
+            return max(0, int(np.searchsorted(self.columns["time"], elapsed, side="right")) - 1)
+        return max(0, bisect.bisect_right(self.columns["time"], elapsed) - 1)
+
+    def record(self, index):
+        """A row as plain Python values, in the same form as roll_weather_values."""
+        columns = self.columns
+        weather_type = WEATHER_TYPES[int(columns["weather"][index])]
+        precipitation, _ = PRECIPITATION.get(weather_type, NO_PRECIPITATION)
+        return {
+            "time": float(columns["time"][index]),
+            "weather": weather_type,
+            "temperature": float(columns["temperature"][index]),
+            "wind_speed": float(columns["wind_speed"][index]),
+            "wind_direction": WIND_DIRECTIONS[int(columns["wind_direction"][index])],
+            "feels_like": float(columns["feels_like"][index]),
+            "pressure": float(columns["pressure"][index]),
+            "visibility": float(columns["visibility"][index]),
+            "precipitation": precipitation
+        }
+
+    def time_share(self):
+        """Share of the simulated time spent in each weather type."""
+        if np is not None:
+            durations = np.diff(self.columns["time"], append=self.duration())
+            spent = np.bincount(self.columns["weather"], weights=durations, minlength=len(WEATHER_TYPES))
+            total = spent.sum() or 1
+            return {weather_type: float(seconds / total) for weather_type, seconds in zip(WEATHER_TYPES, spent)}
+        times = list(self.columns["time"]) + [self.duration()]
+        spent = dict.fromkeys(WEATHER_TYPES, 0.0)
+        for index in range(len(self)):
+            spent[WEATHER_TYPES[int(self.columns["weather"][index])]] += times[index + 1] - times[index]
+        total = sum(spent.values()) or 1
+        return {weather_type: seconds / total for weather_type, seconds in spent.items()}
+
+def simulate(days, seed, day_length=60):
+    """Simulate days game days (of day_length seconds) of weather changes in one batch.
+
+    Changes follow the live Weather: a first change after FIRST_CHANGE seconds, then one every
+    CHANGE_INTERVAL seconds, each picking a new type and a fresh set of values.
+
+    A seed is reproducible per backend only: NumPy's generator and the random.Random used
+    without NumPy (by simulate_python) draw different sequences, so the same seed gives two
+    different timelines. Neither matches the live Weather(seed=...), which draws its values
+    one change at a time as the game runs.
+    """
+    horizon = days * day_length
+    if np is None:
+        return simulate_python(horizon, seed, day_length)
+    rng = np.random.default_rng(seed)
+    # Upper bound on the number of changes, the unused tail is cut off below
+    count = int(math.ceil(max(horizon - FIRST_CHANGE[0], 0) / CHANGE_INTERVAL[0])) + 2
+    intervals = rng.integers(CHANGE_INTERVAL[0], CHANGE_INTERVAL[1] + 1, size=count)
+    intervals[0] = rng.integers(FIRST_CHANGE[0], FIRST_CHANGE[1] + 1)
+    times = np.concatenate(([0], np.cumsum(intervals)))
+    times = times[times <= horizon].astype(np.float64)
+    rows = len(times)
+
+    weather = rng.integers(0, len(WEATHER_TYPES), size=rows).astype(np.uint8)
+    temperature = np.round(rng.uniform(BASE_TEMPERATURE - TEMPERATURE_VARIATION, BASE_TEMPERATURE + TEMPERATURE_VARIATION, rows), 2)
+    wind_speed = np.round(rng.uniform(*WIND_SPEED_RANGE, rows), 2)
+    wind_direction = rng.integers(0, len(WIND_DIRECTIONS), size=rows).astype(np.uint8)
+    pressure = np.round(rng.uniform(*PRESSURE_RANGE, rows), 3)
+    # Visibility range depends on the weather type
+    low = np.array([PRECIPITATION.get(name, NO_PRECIPITATION)[1][0] for name in WEATHER_TYPES], dtype=np.float64)
+    high = np.array([PRECIPITATION.get(name, NO_PRECIPITATION)[1][1] for name in WEATHER_TYPES], dtype=np.float64)
+    visibility = np.round(low[weather] + rng.random(rows) * (high[weather] - low[weather]), 1)
+    feels_like = np.round(np.maximum(temperature - wind_speed / 20, -273.15), 2)
+
+    columns = {
+        "time": times,
+        "weather": weather,
+        "temperature": temperature,
+        "wind_speed": wind_speed,
+        "wind_direction": wind_direction,
+        "feels_like": feels_like,
+        "pressure": pressure,
+        "visibility": visibility
+    }
+    return WeatherTimeline(columns, seed, day_length)
+
+def simulate_python(horizon, seed, day_length):
+    # Same model as simulate, but its own draws: a seed gives a different timeline here
+    rng = random.Random(seed)
+    columns = {name: [] for name in COLUMNS}
+    now = 0
+    interval = FIRST_CHANGE
+    while now <= horizon:
+        weather_type = rng.choice(WEATHER_TYPES)
+        values = roll_weather_values(rng, weather_type)
+        columns["time"].append(float(now))
+        columns["weather"].append(WEATHER_TYPES.index(weather_type))
+        columns["wind_direction"].append(WIND_DIRECTIONS.index(values["wind_direction"]))
+        for name in ("temperature", "wind_speed", "feels_like", "pressure", "visibility"):
+            columns[name].append(values[name])
+        now += rng.randint(*interval)
+        interval = CHANGE_INTERVAL
+    return WeatherTimeline(columns, seed, day_length)
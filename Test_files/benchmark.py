@@ -0,0 +1,207 @@
+"""Headless benchmark: replays scripted camera paths and forced weather types through the
+game's subsystems and writes frame-time percentiles per subsystem as JSON.
+
+    python Test_files/benchmark.py --frames 300 --output benchmark_results.json
+"""
+import argparse
+import collections
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+STAGES = ["weather_update", "details_panel", "ui_update", "ground", "weather", "cards", "ui_draw", "flip"]
+WEATHER_TYPES = ["clear", "overcast", "snowstorm", "fog", "methane rain", "nitrogen snow"]
+REGIONAL = "regional"  # Pseudo weather type: keep the map-wide weather field of the app
+NO_KEYS = collections.defaultdict(bool)  # Stands in for pygame.key.get_pressed()
+
+# camera paths: move the camera for frame number i
+def still(app, i):
+    pass
+
+def slow_pan(app, i):
+    app.camera.x += 2
+
+def fast_diagonal(app, i):
+    # Mouse held in the bottom-right corner, the fastest edge scroll Camera.move allows
+    app.camera.move((app.screen.get_width() - 1, app.screen.get_height() - 1), NO_KEYS)
+
+def teleport(app, i):
+    if i % 30 == 0:
+        app.camera.x += 5000
+        app.camera.y -= 3000
+
+CAMERA_PATHS = {"still": still, "slow_pan": slow_pan, "fast_diagonal": fast_diagonal, "teleport": teleport}
+
+# stats
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def summarize(samples):
+    """Milliseconds: mean, p50, p90, p99 and max of a list of seconds."""
+    values = sorted(sample * 1000 for sample in samples)
+    return {
+        "mean": round(sum(values) / len(values), 4) if values else 0.0,
+        "p50": round(percentile(values, 0.50), 4),
+        "p90": round(percentile(values, 0.90), 4),
+        "p99": round(percentile(values, 0.99), 4),
+        "max": round(values[-1], 4) if values else 0.0
+    }
+
+# benchmark
+class Benchmark:
+    def __init__(self, frames, background=False):
+        import main  # After SDL is pointed at the dummy driver
+        import map
+        self.main = main
+        self.map = map
+        self.frames = frames
+        self.background = background
+        self.app = main.App()
+        for task in self.app.deferred_tasks:
+            task()  # Steady state: what App.run does over its first frames
+        self.app.deferred_tasks.clear()
+        self.field = self.app.weather.field  # Put back for the regional scenarios
+
+    def reset(self, weather_type):
+        """Fresh terrain caches, camera at the origin and a forced weather type."""
+        app = self.app
+        app.ground.close()
+        app.ground = self.map.Ground(app.screen.get_width(), app.screen.get_height(), (self.main.cell_size, self.main.cell_size), background=self.background)
+        app.camera.x, app.camera.y = 0, 0
+        weather = app.weather
+        if weather_type != REGIONAL:
+            weather.field = None  # The forced type everywhere
+            weather.current_weather = weather_type
+        else:
+            weather.field = self.field
+        weather.fog_overlay = None
+        weather.update_weather_values()
+        weather.weather_timer = time.time() + 10 ** 6  # No random changes mid-run
+        weather.particle_fields.clear()
+
+    def frame(self, timings, time_delta):
+        app = self.app
+        screen = app.screen
+        stages = (
+            ("weather_update", lambda: (app.weather.set_position(app.camera.x, app.camera.y, app.ground.zoom_level), app.weather.update())),
+            ("details_panel", app.details_panel.update),
+            ("ui_update", lambda: app.ui_manager.update(time_delta)),
+            ("ground", lambda: app.ground.draw(screen, app.camera.x, app.camera.y)),
+            ("weather", lambda: app.weather.draw(screen)),
+            ("cards", lambda: (app.cardDeck.draw(screen), app.card_grid.draw(screen, debug=True))),
+            ("ui_draw", lambda: app.ui_manager.draw_ui(screen)),
+            ("flip", pygame.display.flip)
+        )
+        frame_start = time.perf_counter()
+        screen.blit(app.background_surface, (0, 0))
+        for name, stage in stages:
+            start = time.perf_counter()
+            stage()
+            timings[name].append(time.perf_counter() - start)
+        timings["frame"].append(time.perf_counter() - frame_start)
+
+    def run_scenario(self, path_name, weather_type):
+        move_camera = CAMERA_PATHS[path_name]
+        # Timed pass
+        self.reset(weather_type)
+        timings = collections.defaultdict(list)
+        for i in range(self.frames):
+            pygame.event.pump()
+            self.frame(timings, 1 / 64)
+            move_camera(self.app, i)
+        cache_stats = self.app.ground.cache_stats()
+        generated = {"chunks_generated": self.app.ground.chunks_built, "chunks_loaded": self.app.ground.chunks_loaded}
+        # Separate traced pass, tracemalloc would distort the timings
+        self.reset(weather_type)
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(min(self.frames, 60)):
+            self.frame(collections.defaultdict(list), 1 / 64)
+            move_camera(self.app, i)
+        allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename") if stat.size_diff > 0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {
+            "camera_path": path_name,
+            "weather": weather_type,
+            "frames": self.frames,
+            "stages_ms": {name: summarize(timings[name]) for name in STAGES + ["frame"]},
+            **generated,
+            "cache": cache_stats,
+            "allocations": {"traced_frames": min(self.frames, 60), "net_new_kb": round(allocated / 1024, 1), "peak_kb": round(peak / 1024, 1)}
+        }
+
+    def close(self):
+        self.app.ground.close()
+        pygame.quit()
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Snow Day benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="frames per scenario")
+    parser.add_argument("--paths", nargs="+", default=list(CAMERA_PATHS), choices=list(CAMERA_PATHS))
+    parser.add_argument("--weathers", nargs="+", default=WEATHER_TYPES, choices=WEATHER_TYPES + [REGIONAL])
+    parser.add_argument("--matrix", action="store_true", help="every camera path with every weather type")
+    parser.add_argument("--background", action="store_true", help="generate chunks in the background process pool")
+    parser.add_argument("--output", default="benchmark_results.json")
+    args = parser.parse_args()
+
+    if args.matrix:
+        scenarios = [(path, weather) for path in args.paths for weather in args.weathers]
+    else:
+        # Camera paths in clear weather, then every weather type with a still camera
+        scenarios = [(path, "clear") for path in args.paths] + [("still", weather) for weather in args.weathers if weather != "clear" or "still" not in args.paths]
+
+    output = os.path.abspath(args.output)
+    # Run in a scratch directory so the weather history and tile store of real sessions are untouched
+    workdir = tempfile.mkdtemp(prefix="snowday-bench-")
+    shutil.copytree(os.path.join(ROOT, "Assets"), os.path.join(workdir, "Assets"))
+    os.chdir(workdir)
+    try:
+        benchmark = Benchmark(args.frames, background=args.background)
+        results = []
+        for path_name, weather_type in scenarios:
+            result = benchmark.run_scenario(path_name, weather_type)
+            frame = result["stages_ms"]["frame"]
+            print(f"{path_name:>14} | {weather_type:<13} | frame p50 {frame['p50']:7.3f} ms  p99 {frame['p99']:7.3f} ms | chunks {result['chunks_generated']}")
+            results.append(result)
+        benchmark.close()
+    finally:
+        os.chdir(ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "background": args.background,
+        "scenarios": results
+    }
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Headless check: with a still camera and partial frames, background chunks that arrive
+must all reach the screen. Compares the screen against a full synchronous draw.
+
+    python Test_files/check_partial_frames.py --frames 240
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # No window
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+import map
+from Engine.frame import FramePipeline
+
+SCREEN_SIZE = (800, 600)
+CELL_SIZE = 10
+UI_RECT = pygame.Rect(10, 10, 450, 250)  # Redrawn every frame, like the details panel
+DECK_RECT = pygame.Rect(670, 10, 110, 120)  # And the card deck in the other corner
+
+def count_mismatches(surface, reference):
+    width, height = surface.get_size()
+    return sum(surface.get_at((x, y)) != reference.get_at((x, y))
+               for x in range(0, width, 4) for y in range(0, height, 4))
+
+def run(screen, frames, scroll_buffer, call_update, camera=(0, 0)):
+    """Draw frames with a still camera the way App.run does, returns the mismatching sampled pixels."""
+    ground = map.Ground(*SCREEN_SIZE, (CELL_SIZE, CELL_SIZE), background=True, scroll_buffer=scroll_buffer)
+    frame = FramePipeline()
+    try:
+        for i in range(frames):
+            if call_update:
+                ground.update()
+            frame.add(ground.get_dirty_rects(SCREEN_SIZE, *camera))
+            frame.add([UI_RECT, DECK_RECT])
+            regions = frame.begin(screen)
+            for region in regions or []:
+                screen.set_clip(region)
+                screen.fill((0, 0, 0))
+                ground.draw(screen, *camera)
+            screen.set_clip(None)
+            frame.present()
+            if i > 10 and not ground.generator.pending and not ground.placeholder_keys:
+                break
+            time.sleep(0.005)  # Let the workers finish chunks between frames
+    finally:
+        ground.close()
+
+    reference = pygame.Surface(SCREEN_SIZE)
+    map.Ground(*SCREEN_SIZE, (CELL_SIZE, CELL_SIZE), scroll_buffer=False).draw(reference, *camera)
+    return count_mismatches(screen, reference), frame.partial_frames
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that partial frames show every arrived chunk")
+    parser.add_argument("--frames", type=int, default=240, help="most frames per case")
+    args = parser.parse_args()
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    failed = False
+    for scroll_buffer in (True, False):
+        for call_update in (True, False):
+            mismatches, partial_frames = run(screen, args.frames, scroll_buffer, call_update)
+            failed = failed or mismatches > 0
+            print(f"scroll_buffer={scroll_buffer!s:5} update={call_update!s:5} | {partial_frames} partial frames, "
+                  f"{mismatches} stale sampled pixels")
+    pygame.quit()
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
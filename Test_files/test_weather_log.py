@@ -0,0 +1,108 @@
+"""Crash recovery, cursors and legacy migration of Engine/weather_log.py.
+
+    python -m pytest Test_files/test_weather_log.py
+"""
+import os
+import pickle
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from Engine.weather_log import MAGIC, WeatherLog
+
+def make_log(path, count):
+    log = WeatherLog(str(path))
+    for i in range(count):
+        log.append({"Weather": "Fog", "i": i})
+    return log
+
+def write_pickle(path, records):
+    with open(path, "wb") as file:
+        pickle.dump(records, file)
+
+# recovery
+def test_torn_tail_is_truncated(tmp_path):
+    path = tmp_path / "weather.log"
+    intact_size = make_log(path, 3).end
+    with open(path, "ab") as file:
+        file.write(b"\x40\x00\x00\x00\x00\x00\x00\x00{\"Weather\"")  # Crash in the middle of an append
+    log = WeatherLog(str(path))
+    assert len(log) == 3
+    assert os.path.getsize(path) == intact_size
+    log.append({"i": 3})
+    assert [record["i"] for record in WeatherLog(str(path)).read_all()] == [0, 1, 2, 3]
+
+def test_corrupt_last_record_is_dropped(tmp_path):
+    path = tmp_path / "weather.log"
+    make_log(path, 3)
+    with open(path, "r+b") as file:
+        file.seek(-2, os.SEEK_END)
+        file.write(b"??")  # Checksum no longer matches
+    log = WeatherLog(str(path))
+    assert [record["i"] for record in log.read_all()] == [0, 1]
+    assert log.read_last()["i"] == 1
+
+def test_recovery_waits_for_first_use(tmp_path):
+    path = tmp_path / "weather.log"
+    log = WeatherLog(str(path))
+    assert not log.opened and not path.exists()
+    assert log.read_last() is None
+    assert log.opened and path.read_bytes() == MAGIC
+
+# cursors
+def test_read_since_returns_only_new_records(tmp_path):
+    log = make_log(tmp_path / "weather.log", 2)
+    records, cursor, reset = log.read_since(None)
+    assert reset and [record["i"] for record in records] == [0, 1]
+    assert not log.changed_since(cursor)
+    log.append({"i": 2})
+    records, cursor, reset = log.read_since(cursor)
+    assert not reset and [record["i"] for record in records] == [2]
+
+def test_read_since_after_clear(tmp_path):
+    log = make_log(tmp_path / "weather.log", 3)
+    _, cursor, _ = log.read_since(None)
+    log.clear()
+    log.append({"i": "after"})
+    assert log.changed_since(cursor)
+    records, _, reset = log.read_since(cursor)
+    assert reset and records == [{"i": "after"}]
+
+def test_read_since_after_rewrite(tmp_path):
+    log = make_log(tmp_path / "weather.log", 2)
+    _, cursor, _ = log.read_since(None)
+    log.rewrite([{"i": "a"}, {"i": "b"}, {"i": "c"}])
+    records, _, reset = log.read_since(cursor)
+    assert reset and [record["i"] for record in records] == ["a", "b", "c"]
+    assert len(log) == 3
+
+# migration
+def test_migrate_into_empty_log(tmp_path, capsys):
+    legacy = tmp_path / "weather.pkl"
+    write_pickle(legacy, [{"i": 0}, {"i": 1}])
+    log = WeatherLog(str(tmp_path / "weather.log"), legacy_path=str(legacy))
+    assert log.read_all() == [{"i": 0}, {"i": 1}]
+    assert not legacy.exists() and (tmp_path / "weather.pkl.migrated").exists()
+    assert "Migrated 2 records" in capsys.readouterr().out
+
+def test_migrate_into_non_empty_log_keeps_order(tmp_path):
+    path = tmp_path / "weather.log"
+    make_log(path, 1)
+    legacy = tmp_path / "weather.pkl"
+    write_pickle(legacy, [{"i": "old"}])
+    log = WeatherLog(str(path), legacy_path=str(legacy))
+    assert [record["i"] for record in log.read_all()] == ["old", 0]
+    assert not legacy.exists()
+
+def test_unreadable_pickles_are_left_in_place(tmp_path, capsys):
+    path = tmp_path / "weather.log"
+    make_log(path, 1)
+    legacy = tmp_path / "weather.pkl"
+    for content in (b"not a pickle", pickle.dumps({"i": 0}), pickle.dumps([{"i": object()}])):
+        legacy.write_bytes(content)
+        log = WeatherLog(str(path), legacy_path=str(legacy))
+        assert log.read_all() == [{"Weather": "Fog", "i": 0}]
+        assert legacy.exists() and not (tmp_path / "weather.pkl.migrated").exists()
+        output = capsys.readouterr().out
+        assert "left in place" in output and "Migrated" not in output
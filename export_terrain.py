@@ -0,0 +1,100 @@
+"""Render a rectangle of the Ground world to PNG tiles plus an index.json, without a window.
+
+    python export_terrain.py --chunks -100 -100 100 100 --cell-size 2 --output Data/export
+"""
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Never open a window, also in the workers
+
+import pygame
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import map
+from Engine.noise import sample_area
+
+# worker process
+export_ground = None  # Built once per worker process by init_export_worker
+
+def init_export_worker():
+    global export_ground
+    export_ground = map.Ground(0, 0, (1, 1))
+
+def render_tile(tile, cell_size, level, output):
+    """Runs in a worker process: classifies every cell of a tile and saves it as a PNG."""
+    ground = export_ground
+    chunk_x0, chunk_y0, chunk_x1, chunk_y1 = tile
+    width = (chunk_x1 - chunk_x0) * ground.chunk_size
+    height = (chunk_y1 - chunk_y0) * ground.chunk_size
+    # One noise call for the whole tile, same values as sampling its chunks one by one
+    noise_values = sample_area(ground.noise, chunk_x0 * ground.chunk_size, chunk_y0 * ground.chunk_size, width, height, ground.noise_scale / 2 ** level)
+    indices = ground.classifier.classify(ground.noise_to_temperatures(noise_values))
+    if isinstance(indices, list):
+        biomes = bytes(indices[x][y] for y in range(height) for x in range(width))
+    else:
+        biomes = indices.T.tobytes()  # [x][y] -> row-major (y, x)
+
+    cells = pygame.image.frombytes(biomes, (width, height), "P")
+    cells.set_palette(ground.get_palette())
+    image = pygame.transform.scale(cells, (width * cell_size, height * cell_size)) if cell_size != 1 else cells
+    file_name = f"tile_{chunk_x0}_{chunk_y0}.png"
+    pygame.image.save(image, os.path.join(output, file_name))
+    return {"file": file_name, "chunks": list(tile), "size": list(image.get_size())}
+
+# export
+def get_tiles(chunk_rect, tile_chunks):
+    """Split a chunk rectangle (x0, y0, x1, y1, end exclusive) into tiles of at most tile_chunks per side."""
+    chunk_x0, chunk_y0, chunk_x1, chunk_y1 = chunk_rect
+    return [(tile_x, tile_y, min(tile_x + tile_chunks, chunk_x1), min(tile_y + tile_chunks, chunk_y1))
+            for tile_y in range(chunk_y0, chunk_y1, tile_chunks)
+            for tile_x in range(chunk_x0, chunk_x1, tile_chunks)]
+
+def export_terrain(chunk_rect, output, cell_size=1, tile_chunks=16, level=0, workers=None):
+    """Render every chunk in chunk_rect to PNG tiles in output and write output/index.json."""
+    os.makedirs(output, exist_ok=True)
+    tiles = get_tiles(chunk_rect, tile_chunks)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    entries = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_export_worker) as executor:
+        futures = [executor.submit(render_tile, tile, cell_size, level, output) for tile in tiles]
+        for done, future in enumerate(as_completed(futures), 1):
+            entries.append(future.result())
+            if done % 50 == 0 or done == len(futures):
+                print(f"{done}/{len(futures)} tiles")
+    elapsed = time.perf_counter() - start
+
+    ground = map.Ground(0, 0, (cell_size, cell_size))
+    chunk_count = (chunk_rect[2] - chunk_rect[0]) * (chunk_rect[3] - chunk_rect[1])
+    index = {
+        "generation": ground.get_generation_params(),
+        "palette": dict(zip(ground.biome_names, ground.get_palette())),
+        "level": level,
+        "cell_size": cell_size,  # Pixels per cell in the tiles
+        "chunk_pixels": ground.chunk_size * cell_size,
+        "chunks": list(chunk_rect),
+        "tiles": sorted(entries, key=lambda entry: (entry["chunks"][1], entry["chunks"][0]))
+    }
+    with open(os.path.join(output, "index.json"), "w") as file:
+        json.dump(index, file, indent=2)
+    print(f"Exported {chunk_count} chunks in {len(tiles)} tiles to {output} in {elapsed:.2f}s with {workers} workers")
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Ground terrain to PNG tiles")
+    parser.add_argument("--chunks", nargs=4, type=int, required=True, metavar=("X0", "Y0", "X1", "Y1"),
+                        help="chunk rectangle to export, end exclusive")
+    parser.add_argument("--cell-size", type=int, default=1, help="pixels per cell")
+    parser.add_argument("--tile-chunks", type=int, default=16, help="chunks per tile side")
+    parser.add_argument("--level", type=int, default=0, help="zoom level, each cell covers 2 ** level cells")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--output", default="Data/export")
+    args = parser.parse_args()
+    if args.chunks[2] <= args.chunks[0] or args.chunks[3] <= args.chunks[1]:
+        parser.error("--chunks needs X1 > X0 and Y1 > Y0")
+    export_terrain(tuple(args.chunks), args.output, args.cell_size, args.tile_chunks, args.level, args.workers)
+
+if __name__ == "__main__":
+    main()
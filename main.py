@@ -1,7 +1,13 @@
+import time
+STARTUP_BEGIN = time.perf_counter()  # Before the heavy imports, for the startup report
+
 from Container.imports_library import *
 from Displays.main_display import *
 from Displays.card_display import *
 import map
+from Engine.frame import FramePipeline
+from Engine.profiler import FrameProfiler, StartupTimer
+from Engine.assets import AssetManager
 
 screenWidth, screenHeight = 1280, 720
 clock = pygame.time.Clock()
@@ -15,7 +21,8 @@ class Camera:
         self.size = size
         self.color = pygame.Color("Red")
         self.edge_size = 50 # Size of edge area that triggers scrolling
-        self.speed = 10
+        self.base_speed = 10
+        self.speed = self.base_speed
 
     def draw(self, screen, camera_offset_x, camera_offset_y):
         # Draw player at center of screen
@@ -52,40 +59,109 @@ class Camera:
 class App:
     def __init__(self):
         super().__init__()
+        self.startup = StartupTimer(STARTUP_BEGIN)
+        self.startup.mark("imports")
         pygame.init()
         self.screen = pygame.display.set_mode((screenWidth, screenHeight), pygame.RESIZABLE)
         pygame.display.set_caption("Snow Day")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.startup.mark("display")
         # ui_manager
         self.background_surface = pygame.Surface((screenWidth, screenHeight)).convert()
         self.ui_manager = UIManager((screenWidth, screenHeight))
+        self.startup.mark("ui_manager")
         # map
-        self.weather = map.Weather()
+        # Regional weather, one field grid point per chunk (16 cells)
+        self.weather = map.Weather(regional=True, region_size=16 * cell_size)
         self.details_panel = Details_Panel(self.ui_manager, self.weather)
-        self.ground = map.Ground(screenWidth, screenHeight, (cell_size,cell_size))
+        self.startup.mark("weather")
+        self.ground = map.Ground(screenWidth, screenHeight, (cell_size,cell_size), background=True,
+                                 tile_directory=os.path.join(os.getcwd(), "Data/terrain"))
+        self.startup.mark("ground")
         # display
         self.detail_window = WeatherWindow(self.ui_manager, (screenWidth, screenHeight), self.details_panel)
         # cards
         self.PATH_BACK = os.path.join(os.getcwd(), "Assets/cardBack.png")
         self.PATH_FRONT = os.path.join(os.getcwd(), "Assets/cardFront.png")
         self.card_grid = GridSystem((screenWidth - 120, 120, 100, screenHeight - 130), grid_size=(1, 5))
-        self.cardDeck = CardDeck_Display(pos=(screenWidth - 130, 10), size=(100, 120), screen_size=(screenWidth, screenHeight), back_image_path=self.PATH_BACK, front_image_path=self.PATH_FRONT, grid_system=self.card_grid)
+        self.assets = AssetManager()
+        self.cardDeck = CardDeck_Display(pos=(screenWidth - 130, 10), size=(100, 120), screen_size=(screenWidth, screenHeight), back_image_path=self.PATH_BACK, front_image_path=self.PATH_FRONT, grid_system=self.card_grid, assets=self.assets)
+        self.startup.mark("cards")
+        # Work that nothing on the first frame needs, run one task per frame once it is shown
+        self.deferred_tasks = [self.details_panel.load_history, self.cardDeck.preload]
 
         # camera
         self.camera = Camera(0, 0)
         self.camera_position = Camera(0, 0)
+        # frame pipeline: only the regions layers report as dirty are redrawn and pushed
+        self.frame = FramePipeline()
+        self.drawn_camera = None
+        # profiler: F3 toggles the overlay, F4 saves the recorded timings to CSV
+        self.profiler = FrameProfiler(enabled=os.environ.get("SNOWDAY_PROFILE") == "1")
+
+    def set_zoom_level(self, level):
+        # The camera covers the same screen distance per frame at every zoom level
+        level = self.ground.set_zoom_level(level)
+        self.camera.speed = self.camera.base_speed * 2 ** level
+        self.frame.invalidate()
+
+    def get_ui_rects(self):
+        # Screen areas covered by the pygame_gui windows
+        rects = [self.details_panel.details_panel.rect]
+        if self.detail_window.window_open and getattr(self.detail_window, 'center_panel', None):
+            rects.append(self.detail_window.center_panel.rect)
+        return rects
+
+    def draw_region(self, region):
+        """Recomposite every layer inside one screen region."""
+        self.screen.set_clip(region)
+        self.screen.blit(self.background_surface, (0, 0))
+        self.profiler.mark("compose")
+
+        self.ground.draw(self.screen, self.camera.x, self.camera.y)
+        self.profiler.mark("ground")
+        self.weather.draw(self.screen)
+        self.profiler.mark("weather")
+        # Draw cards
+        self.cardDeck.draw(self.screen)
+        self.card_grid.draw(self.screen, debug=True)
+        # windows
+        if not self.detail_window.window_open:
+            self.camera.draw(self.screen, self.camera.x, self.camera.y)
+        self.profiler.mark("cards")
+
+        self.ui_manager.draw_ui(self.screen)
+        self.profiler.mark("draw_ui")
+        self.profiler.draw(self.screen)
+        self.profiler.mark("overlay")
 
     def run(self):
         while self.running:
             time_delta = self.clock.tick(64) / 1000.0
+            self.profiler.begin_frame()
             # Get input
             mouse_pos = pygame.mouse.get_pos()
             keys = pygame.key.get_pressed()
-            for event in pygame.event.get():
+            window_was_open = self.detail_window.window_open
+            events = pygame.event.get()
+            for event in events:
                 if event.type == pygame.QUIT:
                     self.running = False
+                    self.ground.close()
                     sys.exit()
+                if event.type == pygame.VIDEORESIZE:
+                    self.frame.invalidate()
+                # zoom: mouse wheel or -/= keys, while the weather window is closed
+                if event.type == pygame.MOUSEWHEEL and not self.detail_window.window_open:
+                    self.set_zoom_level(self.ground.zoom_level - event.y)
+                if event.type == pygame.KEYDOWN and event.key in (pygame.K_MINUS, pygame.K_EQUALS) and not self.detail_window.window_open:
+                    self.set_zoom_level(self.ground.zoom_level + (1 if event.key == pygame.K_MINUS else -1))
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                    self.profiler.toggle()
+                    self.frame.invalidate()
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                    self.profiler.export_csv(os.path.join(os.getcwd(), time.strftime("Data/profile-%Y%m%d-%H%M%S.csv")))
                 self.ui_manager.process_events(event)
                 # details
                 self.details_panel.handle_event(event, self.detail_window)
@@ -94,28 +170,50 @@ class App:
                     self.detail_window.update()
                 # cards
                 self.cardDeck.handle_event(event)
+            self.profiler.mark("events")
 
-            # Draw elements
+            # update (the panel only redraws its labels when the weather changed)
+            # The panel shows the weather where the camera is
+            self.weather.set_position(self.camera.x, self.camera.y, self.ground.zoom_level)
+            self.weather.update()
+            details_changed = self.details_panel.update()
+            self.profiler.mark("update")
             self.ui_manager.update(time_delta)
-            self.screen.blit(self.background_surface, (0, 0))
-
-            self.ground.draw(self.screen, self.camera.x, self.camera.y)
-            self.weather.draw(self.screen)
-            # Draw cards
-            self.cardDeck.draw(self.screen)
-            self.card_grid.draw(self.screen, debug=True)
-            # windows
+            self.detail_window.update_visible_panels()
+            self.profiler.mark("ui_update")
+
+            # Collect what changed since the last frame
+            camera_position = (self.camera.x, self.camera.y)
+            if camera_position != self.drawn_camera or window_was_open != self.detail_window.window_open:
+                self.frame.invalidate()  # Everything scrolls, or the camera marker toggles
+            self.ground.update()  # Chunks that arrived, reported below and drawn this frame
+            self.frame.add(self.ground.get_dirty_rects(self.screen.get_size(), self.camera.x, self.camera.y))
+            self.frame.add(self.weather.get_dirty_rects(self.screen.get_size()))
+            self.frame.add(self.cardDeck.get_dirty_rects())
+            if events or details_changed or self.detail_window.window_open:
+                self.frame.add(self.get_ui_rects())
+            if self.profiler.enabled:  # Off, the profiler costs this check and the marks
+                self.frame.add(self.profiler.update(self.screen, self.ground.cache_stats(), self.frame))
+
+            # Draw elements, once per dirty region and clipped to it
+            regions = self.frame.begin(self.screen)
+            self.profiler.mark("compose")
+            if regions is not None:
+                for region in regions:
+                    self.draw_region(region)
+                self.screen.set_clip(None)
+                self.drawn_camera = camera_position
+
             if not self.detail_window.window_open:
-                self.camera.draw(self.screen, self.camera.x, self.camera.y)
                 self.camera.move(mouse_pos, keys)
-
-            self.ui_manager.draw_ui(self.screen)
-            # update
-            self.details_panel.update()
-            self.weather.update()
-            self.clock.tick(64)
-            pygame.display.flip()
-            pygame.display.update()
+            self.frame.present()
+            self.profiler.mark("flip")
+            self.profiler.end_frame()
+            if not self.startup.finished:
+                self.startup.finish()
+            elif self.deferred_tasks:
+                self.deferred_tasks.pop(0)()
+        self.ground.close()
         pygame.quit()
         sys.exit()
 
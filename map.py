@@ -1,49 +1,160 @@
 import sys
+import math
 import pygame
 import random, time
-from perlin_noise import PerlinNoise
+from Engine.noise import create_noise, sample_chunk
+from Engine import particles
+from Engine.overlay import OverlayCache
+from Engine.chunk_cache import ChunkCache
+from Engine.chunk_data import ChunkData, pack_temperatures
+from Engine.biomes import BiomeClassifier
+from Engine.tile_store import TileStore
+from Engine.chunk_worker import ChunkGenerator
+from Engine import weather_sim
+from Engine.weather_field import WeatherField
 
 # weather
 class Weather:
-    def __init__(self):
+    def __init__(self, overlay_mode="alpha", clock=time.time, seed=None, regional=False, region_size=160):
+        # clock() gives the current time in seconds; a seed makes the weather sequence reproducible
+        self.clock = clock
+        self.rng = random if seed is None else random.Random(seed)
         self.time = 0  # Represents in-game time (0-24 hours)
         self.day_length = 60  # Seconds for a full day
-        self.weather_types = ["clear", "overcast", "snowstorm", "fog", "methane rain", "nitrogen snow"]
-        self.frostbite_risk = random.choice(["Instantaneous", "Severe", "Critical"])
-        self.current_weather = random.choice(self.weather_types)
-        self.weather_timer = time.time() + random.randint(10, 30)  # Next weather change
+        self.weather_types = list(weather_sim.WEATHER_TYPES)
+        self.frostbite_risk = self.rng.choice(["Instantaneous", "Severe", "Critical"])
+        self.current_weather = self.rng.choice(self.weather_types)
+        self.weather_timer = self.clock() + self.rng.randint(*weather_sim.FIRST_CHANGE)  # Next weather change
+        # Playback of a precomputed WeatherTimeline, see play()
+        self.timeline = None
+        self.timeline_start = 0
+        self.timeline_speed = 1.0
+        self.timeline_index = None
+        # Regional weather: the type follows the map position set with set_position
+        self.field = WeatherField(self.rng.randrange(1, 1 << 30), spacing=region_size) if regional else None
+        self.position = (0, 0)  # World pixels
+        self.zoom_level = 0
+        self.fog_overlay = None  # (grid key, fog alphas, scaled surface) of the regional fog
+        if self.field is not None:
+            self.current_weather = self.field.at(*self.position, self.clock())["weather"]
+        self.record_change = True  # False while the change is only the camera crossing into another region
+        # Change notification: version is bumped and subscribers are called on every new set of values
+        self.version = 0
+        self.subscribers = []
         self.update_weather_values()
+        # Persistent particle pools, one per weather type, created on first use
+        self.particle_fields = {}
+        self.last_draw_time = None
+        # Lighting and fog overlays are reused until the lighting phase or window size changes
+        self.overlays = OverlayCache(overlay_mode)
+        self.fog_color = (180, 180, 220, 120)
+        self.drawn_state = None  # What the last frame showed, for dirty-rect reporting
 
     def update_weather_values(self):
         """Generates weather values dynamically."""
-        base_temp = -272.5
-        variation = 1.5
-        self.current_temperature = round(random.uniform(base_temp - variation, base_temp + variation), 2)
-        # Wind speeds
-        self.wind_speed = round(random.uniform(5, 30), 2)
-        self.wind_direction = random.choice(["North", "North-East", "East", "South-East", "South", "South-West", "West", "North-West"])
-
-        self.feels_like = round(max(self.current_temperature - (self.wind_speed / 20), -273.15), 2)
-        self.pressure = round(random.uniform(0.01, 0.05), 3)
+        self.base_values = weather_sim.roll_weather_values(self.rng, self.current_weather)
+        if self.field is None:
+            self.apply_values(self.base_values)
+        else:
+            # The same values everywhere, shown as the region at the camera sees them
+            self.apply_values(self.get_local_values(*self.position, self.base_values, self.current_weather))
+
+    def apply_values(self, values, record=True):
+        """Show a set of values from weather_sim (rolled live or taken from a timeline).
+        record=False marks a change that is not worth a history record."""
+        self.record_change = record
+        self.current_weather = values["weather"]
+        self.current_temperature = values["temperature"]
+        self.wind_speed = values["wind_speed"]
+        self.wind_direction = values["wind_direction"]
+        self.feels_like = values["feels_like"]
+        self.pressure = values["pressure"]
         # At these temperatures, exposure would be instantly fatal to humans
         self.exposure_risk = "Instantly Fatal"
-
         # Special effects for different weather types
-        if self.current_weather == "methane rain":
-            self.precipitation_type = "liquid methane"
-            self.visibility = round(random.uniform(5, 20), 1)
-        elif self.current_weather == "nitrogen snow":
-            self.precipitation_type = "solid nitrogen"
-            self.visibility = round(random.uniform(2, 10), 1)
-        elif self.current_weather == "snowstorm":
-            self.precipitation_type = "hydrogen ice crystals"
-            self.visibility = round(random.uniform(1, 5), 1)
-        elif self.current_weather == "fog":
-            self.precipitation_type = "helium mist"
-            self.visibility = round(random.uniform(3, 8), 1)
-        else:
-            self.precipitation_type = "none"
-            self.visibility = round(random.uniform(20, 100), 1)
+        self.precipitation_type = values["precipitation"]
+        self.visibility = values["visibility"]
+        self.notify_change()
+
+    def set_position(self, world_x, world_y, zoom_level=0):
+        """Where the weather is looked at (the camera), used by the regional field."""
+        self.position = (world_x, world_y)
+        self.zoom_level = zoom_level
+
+    def get_local_values(self, world_x, world_y, values=None, current=None):
+        """values (default: the last rolled ones) adjusted to the regional weather at a world position,
+        current is the type shown there now (see WeatherField.at)."""
+        values = values or self.base_values
+        local = self.field.at(world_x, world_y, self.clock(), current)
+        precipitation, (low, high) = weather_sim.PRECIPITATION.get(local["weather"], weather_sim.NO_PRECIPITATION)
+        wind_speed = round(values["wind_speed"] * (0.5 + local["intensity"]), 2)
+        return {
+            "weather": local["weather"],
+            "temperature": values["temperature"],
+            "wind_speed": wind_speed,
+            "wind_direction": values["wind_direction"],
+            "feels_like": weather_sim.get_feels_like(values["temperature"], wind_speed),
+            "pressure": values["pressure"],
+            "visibility": round(high - (high - low) * local["intensity"], 1),  # Stronger weather, shorter sight
+            "precipitation": precipitation,
+            "intensity": round(local["intensity"], 2)
+        }
+
+    def get_local_conditions(self, world_x, world_y):
+        """Weather report for a world position, the global report without a regional field."""
+        if self.field is None:
+            return self.get_weather_report()
+        values = self.get_local_values(world_x, world_y)
+        return {
+            "Temperature": values["temperature"],
+            "Weather": values["weather"].capitalize(),
+            "Wind": (values["wind_speed"], values["wind_direction"]),
+            "Feels like": values["feels_like"],
+            "Atmospheric pressure": values["pressure"],
+            "Visibility": values["visibility"],
+            "Exposure risk": self.exposure_risk,
+            "Precipitation": values["precipitation"],
+            "Intensity": values["intensity"]
+        }
+
+    def update_region(self):
+        # Crossing into another region (or a region drifting over the camera) updates the labels,
+        # the history only records the timed changes
+        values = self.get_local_values(*self.position, current=self.current_weather)
+        if values["weather"] != self.current_weather:
+            self.apply_values(values, record=False)
+
+    def play(self, timeline, speed=1.0):
+        """Follow a precomputed WeatherTimeline from now on, speed game seconds per clock second."""
+        self.timeline = timeline
+        self.timeline_start = self.clock()
+        self.timeline_speed = speed
+        self.timeline_index = None
+        self.day_length = timeline.day_length
+        self.update()
+
+    def stop(self):
+        """Back to live random weather, starting from what is shown now."""
+        self.timeline = None
+        self.timeline_index = None
+        self.weather_timer = self.clock() + self.rng.randint(*weather_sim.CHANGE_INTERVAL)
+
+    def get_elapsed(self):
+        """Game seconds since playback started."""
+        return (self.clock() - self.timeline_start) * self.timeline_speed
+
+    def subscribe(self, callback):
+        """callback(weather) runs whenever the weather values change."""
+        self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def notify_change(self):
+        self.version += 1
+        for callback in list(self.subscribers):
+            callback(self)
 
     def get_lighting(self):
         """Returns a color overlay based on time of day."""
@@ -56,10 +167,125 @@ class Weather:
 
     def draw(self, screen):
         """Draws weather effects and lighting."""
-        overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-        overlay.fill(self.get_lighting())  # Apply lighting
-        screen.blit(overlay, (0, 0))
+        self.drawn_state = self.get_draw_state(screen.get_size())
+        self.overlays.blit(screen, self.get_lighting())  # Apply lighting
 
+        if self.field is not None:
+            self.draw_regional_fog(screen)
+        elif self.current_weather == "fog":
+            self.overlays.blit(screen, self.fog_color)
+
+        now = time.perf_counter()
+        dt = 0 if self.last_draw_time is None else min(now - self.last_draw_time, 0.1)
+        self.last_draw_time = now
+        if particles.np is None:
+            self.draw_scattered_particles(screen)  # Without NumPy, the weather at the camera
+            return
+        if self.field is not None:
+            self.draw_regional_particles(screen, dt)
+            return
+
+        field = self.get_particle_field(screen.get_size())
+        if field is not None:
+            field.update(dt, self.wind_speed, self.wind_direction)
+            field.draw(screen)
+
+    def get_draw_state(self, screen_size):
+        fog = self.get_fog_grid(screen_size)[1] if self.field is not None else None
+        return (self.get_lighting(), self.current_weather, screen_size, fog)
+
+    def get_screen_grid(self, screen_size):
+        """Field grid points covering the screen: (key, types, intensity), key is
+        (first_x, first_y, columns, rows, spacing in world pixels)."""
+        step = 2 ** self.zoom_level  # One grid point per on-screen chunk at every zoom level
+        spacing = self.field.spacing * step
+        half_width, half_height = screen_size[0] / 2 * step, screen_size[1] / 2 * step
+        first_x = math.floor((self.position[0] - half_width) / spacing)
+        first_y = math.floor((self.position[1] - half_height) / spacing)
+        columns = math.floor((self.position[0] + half_width) / spacing) - first_x + 2
+        rows = math.floor((self.position[1] + half_height) / spacing) - first_y + 2
+        types, intensity, _ = self.field.sample_grid(first_x * step, first_y * step, columns, rows, self.clock(), step)
+        return (first_x, first_y, columns, rows, spacing), types, intensity
+
+    def get_grid_origin(self, key, screen_size):
+        # Screen position of grid point (first_x, first_y)
+        first_x, first_y, _, _, spacing = key
+        return ((first_x * spacing - self.position[0]) / 2 ** self.zoom_level + screen_size[0] / 2,
+                (first_y * spacing - self.position[1]) / 2 ** self.zoom_level + screen_size[1] / 2)
+
+    def get_particle_types(self, screen_size):
+        """Weather types whose particles are on screen."""
+        if self.field is None or particles.np is None:
+            return [self.current_weather] if self.current_weather in particles.PARTICLE_STYLES else []
+        types = self.get_screen_grid(screen_size)[1]
+        names = (weather_sim.WEATHER_TYPES[index] for index in particles.np.unique(types).tolist())
+        return [name for name in names if name in particles.PARTICLE_STYLES]
+
+    def draw_regional_particles(self, screen, dt):
+        """One pool per weather type on screen, each particle drawn only over grid points of its
+        type, and fewer of them where the intensity is low."""
+        np = particles.np
+        screen_size = screen.get_size()
+        key, types, intensity = self.get_screen_grid(screen_size)
+        types, intensity = np.asarray(types), np.asarray(intensity)
+        origin_x, origin_y = self.get_grid_origin(key, screen_size)
+        columns, rows, screen_spacing = key[2], key[3], self.field.spacing
+        for weather_type in self.get_particle_types(screen_size):
+            field = self.get_particle_field(screen_size, weather_type)
+            field.update(dt, self.wind_speed, self.wind_direction)
+            # Each particle belongs to its nearest grid point
+            column = np.clip(np.rint((field.positions[:, 0] - origin_x) / screen_spacing).astype(np.intp), 0, columns - 1)
+            row = np.clip(np.rint((field.positions[:, 1] - origin_y) / screen_spacing).astype(np.intp), 0, rows - 1)
+            mask = (types[column, row] == weather_sim.WEATHER_TYPES.index(weather_type)) & (field.levels < intensity[column, row])
+            field.draw(screen, mask)
+
+    def get_fog_grid(self, screen_size):
+        """Grid points covering the screen and their fog alphas: (key, alphas as bytes, or None without fog)."""
+        key, types, intensity = self.get_screen_grid(screen_size)
+        columns, rows = key[2], key[3]
+        fog_index = weather_sim.WEATHER_TYPES.index("fog")
+        alphas = bytes(int(self.fog_color[3] * intensity[x][y]) if types[x][y] == fog_index else 0
+                       for y in range(rows) for x in range(columns))
+        return key, (alphas if any(alphas) else None)
+
+    def draw_regional_fog(self, screen):
+        """Fog only where the field has fog, smoothly interpolated between grid points."""
+        key, alphas = self.get_fog_grid(screen.get_size())
+        if alphas is None:
+            return
+        columns, rows = key[2], key[3]
+        screen_spacing = self.field.spacing
+        if self.fog_overlay is None or self.fog_overlay[:2] != (key[2:], alphas):
+            grid = pygame.Surface((columns, rows), pygame.SRCALPHA)
+            for index, alpha in enumerate(alphas):
+                grid.set_at((index % columns, index // columns), (*self.fog_color[:3], alpha))
+            surface = pygame.transform.smoothscale(grid, (round(columns * screen_spacing), round(rows * screen_spacing)))
+            self.fog_overlay = (key[2:], alphas, surface)
+        # Grid point (i, j) is the centre of pixel (i, j) of the small grid surface
+        origin_x, origin_y = self.get_grid_origin(key, screen.get_size())
+        screen.blit(self.fog_overlay[2], (round(origin_x - screen_spacing / 2), round(origin_y - screen_spacing / 2)))
+
+    def get_dirty_rects(self, screen_size):
+        """[] while the weather looks the same as last frame, None (whole screen) otherwise."""
+        if self.get_particle_types(screen_size) or self.get_draw_state(screen_size) != self.drawn_state:
+            return None
+        return []
+
+    def get_particle_field(self, screen_size, weather_type=None):
+        """Particle pool for a weather type (default: the current one), or None if it has no particles."""
+        weather_type = weather_type or self.current_weather
+        style = particles.PARTICLE_STYLES.get(weather_type)
+        if style is None:
+            return None
+        field = self.particle_fields.get(weather_type)
+        if field is None:
+            field = particles.ParticleField(style, screen_size)
+            self.particle_fields[weather_type] = field
+        field.resize(screen_size)
+        return field
+
+    def draw_scattered_particles(self, screen):
+        """Fallback without NumPy: scatter fresh particles every frame."""
         if self.current_weather == "snowstorm":
             for _ in range(100):
                 x, y = random.randint(0, screen.get_width()), random.randint(0, screen.get_height())
@@ -73,9 +299,6 @@ class Weather:
                 x, y = random.randint(0, screen.get_width()), random.randint(0, screen.get_height())
                 pygame.draw.circle(screen, (200, 225, 255), (x, y), random.uniform(0.2, 0.4))
         elif self.current_weather == "fog":
-            fog_overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            fog_overlay.fill((180, 180, 220, 120))
-            screen.blit(fog_overlay, (0, 0))
             # Add swirling fog particles
             for _ in range(30):
                 x, y = random.randint(0, screen.get_width()), random.randint(0, screen.get_height())
@@ -83,12 +306,26 @@ class Weather:
 
     def update(self):
         """Update time and weather conditions."""
-        self.time = (time.time() % self.day_length) / self.day_length * 24  # Simulate 24-hour cycle
-
-        if time.time() > self.weather_timer:
-            self.current_weather = random.choice(self.weather_types)
+        if self.timeline is not None:
+            self.update_playback()
+            return
+        self.time = (self.clock() % self.day_length) / self.day_length * 24  # Simulate 24-hour cycle
+
+        if self.clock() > self.weather_timer:
+            if self.field is None:
+                self.current_weather = self.rng.choice(self.weather_types)  # The field picks the type otherwise
             self.update_weather_values()  # Refresh weather data
-            self.weather_timer = time.time() + random.randint(15, 45)
+            self.weather_timer = self.clock() + self.rng.randint(*weather_sim.CHANGE_INTERVAL)
+        elif self.field is not None:
+            self.update_region()
+
+    def update_playback(self):
+        elapsed = self.get_elapsed()
+        self.time = (elapsed % self.day_length) / self.day_length * 24
+        index = self.timeline.index_at(elapsed)
+        if index != self.timeline_index:
+            self.timeline_index = index
+            self.apply_values(self.timeline.record(index))
 
     def get_weather_report(self):
         """Returns a formatted string with current weather conditions."""
@@ -105,11 +342,15 @@ class Weather:
 
 # ground
 class Segment:
-    def __init__(self, x, y, width, height, color):
+    """View of a single cell, built on demand from a ChunkData."""
+    __slots__ = ("x", "y", "width", "height", "color", "biome")
+
+    def __init__(self, x, y, width, height, color, biome=None):
         self.x, self.y = x, y
         self.width = width
         self.height = height
         self.color = color
+        self.biome = biome
 
     def draw(self, screen):
         pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
@@ -118,7 +359,9 @@ class Segment:
         self.color = new_color
 
 class Ground:
-    def __init__(self, screen_width, screen_height, cell_size):
+    def __init__(self, screen_width, screen_height, cell_size, noise_backend="auto", max_chunks=2048, max_surface_bytes=48 * 1024 * 1024,
+                 background=False, workers=None, max_integrations_per_frame=4, keep_temperatures=False,
+                 tile_directory=None, scroll_buffer=True, view_margin=1):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.cell_size = cell_size
@@ -128,117 +371,400 @@ class Ground:
         self.AVG_ANTARCTICA_TEMP = -60  # Avg temp in Antarctica (°C)
         self.EXTREME_COLD_FACTOR = 100  # Scaling factor
         self.BASE_TEMP = self.AVG_ANTARCTICA_TEMP * self.EXTREME_COLD_FACTOR
+        self.TEMPERATURE_RANGE = 40  # Noise [-1, 1] is scaled by this around BASE_TEMP
         # Cache for generated chunks
         self.chunk_size = 16  # Size of each chunk in cells
-        self.chunks = {}  # Dictionary to store generated chunks
-        # noise
-        self.noise = PerlinNoise(octaves=4, seed=sys.maxsize)
-        # biomes
+        self.chunks = ChunkCache(max_chunks=max_chunks, sizeof=self.get_chunk_bytes)  # LRU of generated chunks
+        self.keep_temperatures = keep_temperatures  # Store a float32 temperature grid with each chunk
+        # noise ("auto" uses the vectorized NumPy engine when available, else perlin_noise)
+        self.seed = sys.maxsize
+        self.noise_octaves = 4
+        self.noise_scale = 200
+        self.noise = create_noise(octaves=self.noise_octaves, seed=self.seed, backend=noise_backend)
+        # Background generation in a process pool (None generates synchronously in draw)
+        self.generator = None
+        if background:
+            self.generator = ChunkGenerator(self.noise_octaves, self.seed, noise_backend, self.chunk_size, self.noise_scale, workers=workers)
+        self.max_integrations_per_frame = max_integrations_per_frame
+        self.updated = False  # The caller runs update() every frame, so draw() (maybe once per dirty region) never integrates
+        self.placeholder_color = (120, 130, 160)  # Drawn until a background chunk arrives
+        self.placeholder_keys = set()  # Chunks currently shown as placeholders
+        self.view_margin = view_margin  # Chunks generated and kept around the visible ones
+        # Zoom: at level L every cell covers 2 ** L cells of level 0, see get_chunk_key
+        self.zoom_level = 0
+        self.max_zoom_level = 4
+        # biomes (chunks store indices into biome_names, see Engine/biomes.py)
+        self.classifier = BiomeClassifier(self.BASE_TEMP)
         self.BIOMES = self.get_biomes()
+        self.biome_names = self.classifier.names
+        # Baked chunk surfaces, one blit per chunk
+        self.chunk_surfaces = ChunkCache(max_bytes=max_surface_bytes, sizeof=self.get_surface_bytes)
+        self.render_settings = self.get_render_settings()
+        # Viewport buffer: scrolled by the camera delta, only newly exposed strips are drawn
+        self.scroll_buffer = scroll_buffer
+        self.buffer = None
+        self.buffer_state = None  # (camera_x, camera_y, level, render settings) the buffer shows
+        self.buffer_placeholders = set()  # Placeholders painted into the buffer
+        self.buffer_redraws = 0
+        self.resident_view_keys = None  # View keys that were all generated last frame
+        self.buffer_scrolls = 0
+        # Optional on-disk tile store, so revisits and warm starts skip generation
+        self.chunks_built = 0  # Chunks classified from noise, synchronously or in the background
+        self.chunks_loaded = 0  # Chunks read back from the tile store instead
+        self.tile_store = None
+        if tile_directory is not None:
+            self.tile_store = TileStore(tile_directory, self.get_generation_params(), self.chunk_size * self.chunk_size)
+
+    def get_generation_params(self):
+        # Everything that decides which biome a cell gets; the tile store is keyed by this
+        return {
+            "seed": self.seed,
+            "octaves": self.noise_octaves,
+            "noise_scale": self.noise_scale,
+            "chunk_size": self.chunk_size,
+            "base_temp": self.BASE_TEMP,
+            "temperature_range": self.TEMPERATURE_RANGE,
+            "thresholds": self.classifier.thresholds,
+            "biomes": self.classifier.names
+        }
 
     def get_biomes(self):
         # Biomes suitable for extreme cold
-        BIOMES = {
-            'deep_frozen_ocean': (0, 0, 80),
-            'frozen_ocean': (0, 20, 150),
-            'ice_shelf': (200, 200, 255),
-            'glacier': (220, 220, 220),
-            'permafrost': (150, 150, 150),
-            'polar_desert': (180, 180, 180),
-            'snow_fields': (255, 255, 255)
-        }
-        return BIOMES
+        return dict(zip(self.classifier.names, self.classifier.palette))
 
     def set_biome(self, temperature):
-        if temperature < self.BASE_TEMP + 5:
-            return 'deep_frozen_ocean'
-        elif temperature < self.BASE_TEMP + 10:
-            return 'frozen_ocean'
-        elif temperature < self.BASE_TEMP + 15:
-            return 'ice_shelf'
-        elif temperature < self.BASE_TEMP + 20:
-            return 'glacier'
-        elif temperature < self.BASE_TEMP + 25:
-            return 'permafrost'
-        elif temperature < self.BASE_TEMP + 30:
-            return 'polar_desert'
-        else:
-            return 'snow_fields'
+        return self.classifier.name(self.classifier.classify_one(temperature))
 
     def get_temperature(self, world_x, world_y):
         # Get temperature value for world coordinates
-        noise_value = self.noise([world_x / 200, world_y / 200])
-        return self.BASE_TEMP + (noise_value * 40)
+        noise_value = self.noise([world_x / self.noise_scale, world_y / self.noise_scale])
+        return self.BASE_TEMP + (noise_value * self.TEMPERATURE_RANGE)
 
-    def get_chunk_key(self, chunk_x, chunk_y):
-        return f"{chunk_x}_{chunk_y}"
+    def get_chunk_temperatures(self, chunk_x, chunk_y, level=0):
+        # Temperatures for a whole chunk, indexed [x][y]; zoomed out levels sample the noise 2 ** level cells apart
+        return self.noise_to_temperatures(sample_chunk(self.noise, chunk_x, chunk_y, self.chunk_size, self.noise_scale / 2 ** level))
 
-    def generate_chunk(self, chunk_x, chunk_y):
-        """Generate a new chunk at the specified chunk coordinates"""
-        chunk_key = self.get_chunk_key(chunk_x, chunk_y)
+    def noise_to_temperatures(self, noise_values):
+        if isinstance(noise_values, list):
+            return [[self.BASE_TEMP + (value * self.TEMPERATURE_RANGE) for value in column] for column in noise_values]
+        return self.BASE_TEMP + (noise_values * self.TEMPERATURE_RANGE)
 
-        if chunk_key in self.chunks:
-            return self.chunks[chunk_key]
+    def get_chunk_key(self, chunk_x, chunk_y, level=0):
+        """(chunk_x, chunk_y) at full detail, (chunk_x, chunk_y, level) for zoomed out chunks.
 
-        chunk_data = []
-        for x in range(self.chunk_size):
-            for y in range(self.chunk_size):
-                # Convert chunk coords to world coords
-                world_x = (chunk_x * self.chunk_size) + x
-                world_y = (chunk_y * self.chunk_size) + y
+        A level L chunk has the same chunk_size cells as a level 0 chunk, but covers
+        2 ** L by 2 ** L level 0 chunks, so every level costs the same to generate and draw.
+        """
+        if level:
+            return (chunk_x, chunk_y, level)
+        return (chunk_x, chunk_y)
 
-                # Get world position in pixels
-                pixel_x = world_x * self.cell_size[0]
-                pixel_y = world_y * self.cell_size[1]
+    def get_key_level(self, chunk_key):
+        return chunk_key[2] if len(chunk_key) > 2 else 0
 
-                # Get terrain data at this position
-                temperature = self.get_temperature(world_x, world_y)
-                biome = self.set_biome(temperature)
-                color = self.BIOMES[biome]
+    def get_chunk_bytes(self, chunk):
+        return chunk.nbytes()
 
-                # Create segment
-                segment = Segment(pixel_x, pixel_y, self.cell_size[0], self.cell_size[1], color)
-                chunk_data.append(segment)
+    def get_surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
 
-        self.chunks[chunk_key] = chunk_data
+    def cache_stats(self):
+        """Hit/miss/eviction counters and resident bytes for the chunk and surface caches."""
+        return {"chunks": self.chunks.stats(), "surfaces": self.chunk_surfaces.stats()}
+
+    def generate_chunk(self, chunk_x, chunk_y, level=0):
+        """Generate a new chunk at the specified chunk coordinates"""
+        chunk_key = self.get_chunk_key(chunk_x, chunk_y, level)
+
+        chunk_data = self.chunks.get(chunk_key)
+        if chunk_data is not None:
+            return chunk_data
+        chunk_data = self.load_chunk(chunk_x, chunk_y, level)
+        if chunk_data is not None:
+            return chunk_data
+        return self.build_chunk(chunk_x, chunk_y, self.get_chunk_temperatures(chunk_x, chunk_y, level), level)
+
+    def load_chunk(self, chunk_x, chunk_y, level=0):
+        """Cache a chunk from the tile store, returns None if it is not stored"""
+        if self.tile_store is None or level:
+            return None  # Only full detail chunks are stored, zoomed out ones are cheap to regenerate
+        tile = self.tile_store.get(chunk_x, chunk_y)
+        if tile is None:
+            return None
+        # Stored tiles carry biome indices only, no temperatures
+        chunk_data = ChunkData(chunk_x, chunk_y, self.chunk_size, tile)
+        self.chunks.put(self.get_chunk_key(chunk_x, chunk_y), chunk_data)
+        self.chunks_loaded += 1
         return chunk_data
 
+    def build_chunk(self, chunk_x, chunk_y, temperatures, level=0):
+        """Turn a chunk's temperature grid into biome indices and cache it"""
+        indices = self.classifier.classify(temperatures)
+        if isinstance(indices, list):
+            biomes = bytes(indices[x][y] for y in range(self.chunk_size) for x in range(self.chunk_size))
+        else:
+            biomes = indices.T.tobytes()  # [x][y] -> row-major (y, x)
+
+        temperature_grid = pack_temperatures(temperatures, self.chunk_size) if self.keep_temperatures else None
+        chunk_data = ChunkData(chunk_x, chunk_y, self.chunk_size, biomes, temperature_grid)
+        self.chunks.put(self.get_chunk_key(chunk_x, chunk_y, level), chunk_data)
+        self.chunks_built += 1
+        if self.tile_store is not None and not level:
+            self.tile_store.put(chunk_x, chunk_y, chunk_data.biomes)
+        return chunk_data
+
+    def get_segment(self, chunk, x, y):
+        """Colour, world pixel position and biome of cell (x, y) in a chunk."""
+        biome = self.biome_names[chunk.biome_index(x, y)]
+        pixel_x = (chunk.chunk_x * self.chunk_size + x) * self.cell_size[0]
+        pixel_y = (chunk.chunk_y * self.chunk_size + y) * self.cell_size[1]
+        return Segment(pixel_x, pixel_y, self.cell_size[0], self.cell_size[1], self.BIOMES[biome], biome)
+
+    def get_local_conditions(self, weather, world_x, world_y):
+        """Weather.get_local_conditions at a world pixel, plus the biome and ground temperature of its cell."""
+        cell_x, cell_y = math.floor(world_x / self.cell_size[0]), math.floor(world_y / self.cell_size[1])
+        chunk_key = self.get_chunk_key(cell_x // self.chunk_size, cell_y // self.chunk_size)
+        chunk = self.chunks.get(chunk_key) if chunk_key in self.chunks else None  # Never generates
+        x, y = cell_x % self.chunk_size, cell_y % self.chunk_size
+        temperature = chunk.temperature(x, y) if chunk is not None else None
+        if temperature is None:
+            temperature = self.get_temperature(cell_x, cell_y)
+        conditions = dict(weather.get_local_conditions(world_x, world_y))
+        conditions["Biome"] = self.biome_names[chunk.biome_index(x, y)] if chunk is not None else self.set_biome(temperature)
+        conditions["Ground temperature"] = round(float(temperature), 1)
+        return conditions
+
+    def get_segments(self, chunk_x, chunk_y):
+        chunk = self.generate_chunk(chunk_x, chunk_y)
+        return [self.get_segment(chunk, x, y) for x in range(self.chunk_size) for y in range(self.chunk_size)]
+
+    def get_palette(self):
+        # BIOMES is the one place colours live, the classifier only provides the defaults
+        return [self.BIOMES[name] for name in self.biome_names]
+
+    def integrate_finished_chunks(self):
+        """Move at most max_integrations_per_frame finished background chunks into the cache."""
+        integrated = []
+        for chunk_key, noise_values in self.generator.collect(self.max_integrations_per_frame):
+            if chunk_key not in self.chunks:
+                self.build_chunk(chunk_key[0], chunk_key[1], self.noise_to_temperatures(noise_values), self.get_key_level(chunk_key))
+                integrated.append(chunk_key)
+        return integrated
+
+    def update(self):
+        """Integrate finished background chunks, once per frame before get_dirty_rects and draw."""
+        if self.generator is not None and self.generator.pending:
+            self.integrate_finished_chunks()
+        self.updated = True
+
+    def set_zoom_level(self, level):
+        """Show the world 2 ** level times smaller, returns the level actually set."""
+        level = max(0, min(self.max_zoom_level, level))
+        if level != self.zoom_level:
+            self.zoom_level = level
+            self.placeholder_keys.clear()
+        return self.zoom_level
+
+    def get_level_camera(self, camera_x, camera_y, level):
+        # Camera position in the pixels of a zoom level, whole pixels keep neighbouring chunks seamless
+        return math.floor(camera_x / 2 ** level), math.floor(camera_y / 2 ** level)
+
+    def get_chunk_screen_rect(self, chunk_x, chunk_y, camera_x, camera_y, screen_size):
+        # camera_x/camera_y in the pixels of the chunk's zoom level
+        chunk_width = self.chunk_size * self.cell_size[0]
+        chunk_height = self.chunk_size * self.cell_size[1]
+        screen_x = chunk_x * chunk_width - math.floor(camera_x) + screen_size[0] // 2
+        screen_y = chunk_y * chunk_height - math.floor(camera_y) + screen_size[1] // 2
+        return pygame.Rect(screen_x, screen_y, chunk_width, chunk_height)
+
+    def get_dirty_rects(self, screen_size, camera_x, camera_y):
+        """Screen rects of placeholders whose real chunk has arrived (None when every baked
+        chunk changed). Camera motion is the caller's business. Call update() first, draw()
+        repaints the placeholders, this only reports them."""
+        if self.get_render_settings() != self.render_settings:
+            return None
+        ready = [chunk_key for chunk_key in self.placeholder_keys if chunk_key in self.chunks]
+        screen_rect = pygame.Rect((0, 0), screen_size)
+        camera_x, camera_y = self.get_level_camera(camera_x, camera_y, self.zoom_level)
+        rects = [self.get_chunk_screen_rect(chunk_key[0], chunk_key[1], camera_x, camera_y, screen_size) for chunk_key in ready]
+        return [rect for rect in rects if screen_rect.colliderect(rect)]
+
+    def get_view_keys(self, camera_x, camera_y, screen_width, screen_height, level=0, margin=0):
+        """Keys of exactly the chunks that intersect the screen around the camera (in the pixels of level),
+        plus margin chunks on every side."""
+        chunk_width = self.chunk_size * self.cell_size[0]
+        chunk_height = self.chunk_size * self.cell_size[1]
+        # Screen left/top edge in level pixels, as in get_chunk_screen_rect
+        left = math.floor(camera_x) - screen_width // 2
+        top = math.floor(camera_y) - screen_height // 2
+        first_x, last_x = left // chunk_width - margin, (left + screen_width - 1) // chunk_width + margin
+        first_y, last_y = top // chunk_height - margin, (top + screen_height - 1) // chunk_height + margin
+        return [self.get_chunk_key(chunk_x, chunk_y, level)
+                for chunk_x in range(first_x, last_x + 1)
+                for chunk_y in range(first_y, last_y + 1)]
+
+    def close(self):
+        """Stop background generation workers and flush the tile store."""
+        if self.generator is not None:
+            self.generator.close()
+        if self.tile_store is not None:
+            self.tile_store.close()
+
+    def get_render_settings(self):
+        # Everything a baked chunk surface depends on
+        return (tuple(self.cell_size), tuple(self.BIOMES.items()))
+
+    def check_render_settings(self):
+        """Drop baked chunks when the cell size or biome colours changed since they were made."""
+        render_settings = self.get_render_settings()
+        if render_settings != self.render_settings:
+            self.render_settings = render_settings
+            self.chunk_surfaces.clear()
+
+    def set_cell_size(self, cell_size):
+        self.cell_size = cell_size
+        self.width = self.screen_width // cell_size[0]
+        self.height = self.screen_height // cell_size[1]
+        self.check_render_settings()
+
+    def set_biome_color(self, biome, color):
+        self.BIOMES[biome] = tuple(color)
+        self.check_render_settings()
+
+    def bake_chunk(self, chunk_x, chunk_y, chunk):
+        """Render a chunk once into an off-screen surface."""
+        # One pixel per cell through the biome palette, then scaled up to cell size
+        cells = pygame.image.frombytes(chunk.biomes, (self.chunk_size, self.chunk_size), "P")
+        cells.set_palette(self.get_palette())
+        surface = pygame.transform.scale(cells, (self.chunk_size * self.cell_size[0], self.chunk_size * self.cell_size[1]))
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        return surface
+
+    def get_chunk_surface(self, chunk_x, chunk_y, level=0):
+        chunk_key = self.get_chunk_key(chunk_x, chunk_y, level)
+        surface = self.chunk_surfaces.get(chunk_key)
+        if surface is None:
+            surface = self.bake_chunk(chunk_x, chunk_y, self.generate_chunk(chunk_x, chunk_y, level))
+            self.chunk_surfaces.put(chunk_key, surface)
+        return surface
+
+    def draw_chunks(self, surface, clip_rect, view_keys, camera_x, camera_y, level, in_buffer=False):
+        """Blit the baked chunks (or placeholders) of view_keys that overlap clip_rect."""
+        # Blits are clipped by the surface, so culling is one rect test per chunk
+        surface.set_clip(clip_rect)
+        screen_size = surface.get_size()
+        for chunk_key in view_keys:
+            chunk_rect = self.get_chunk_screen_rect(chunk_key[0], chunk_key[1], camera_x, camera_y, screen_size)
+            if not clip_rect.colliderect(chunk_rect):
+                continue
+            if chunk_key in self.chunks:
+                surface.blit(self.get_chunk_surface(chunk_key[0], chunk_key[1], level), chunk_rect)
+                if in_buffer:
+                    self.buffer_placeholders.discard(chunk_key)
+                elif self.is_fully_drawn(chunk_rect, clip_rect, screen_size):
+                    self.placeholder_keys.discard(chunk_key)
+            elif in_buffer:
+                surface.fill(self.placeholder_color, chunk_rect)
+                self.buffer_placeholders.add(chunk_key)  # Reaches the screen with the buffer, see show_buffer
+            else:
+                surface.fill(self.placeholder_color, chunk_rect)
+                self.placeholder_keys.add(chunk_key)
+
+    def is_fully_drawn(self, chunk_rect, clip_rect, screen_size):
+        # Every on-screen pixel of the chunk was inside the clip, so no placeholder is left of it
+        return clip_rect.contains(chunk_rect.clip(pygame.Rect((0, 0), screen_size)))
+
+    def show_buffer(self, screen, camera_x, camera_y):
+        """Blit the buffer to the screen (within its clip) and track which placeholders are on screen now."""
+        screen.blit(self.buffer, (0, 0))
+        clip_rect, screen_size = screen.get_clip(), screen.get_size()
+        self.placeholder_keys.update(self.buffer_placeholders)
+        drawn = [chunk_key for chunk_key in self.placeholder_keys
+                 if chunk_key not in self.buffer_placeholders and
+                 self.is_fully_drawn(self.get_chunk_screen_rect(chunk_key[0], chunk_key[1], camera_x, camera_y, screen_size), clip_rect, screen_size)]
+        self.placeholder_keys.difference_update(drawn)
+
+    def update_buffer(self, screen_size, view_keys, camera_x, camera_y, level):
+        """Bring the viewport buffer up to date: scroll it by the camera delta and draw only
+        the exposed strips and placeholders whose chunk has arrived since."""
+        state = (camera_x, camera_y, level, self.render_settings)
+        if self.buffer is None or self.buffer.get_size() != screen_size:
+            self.buffer = pygame.Surface(screen_size)
+            if pygame.display.get_surface() is not None:
+                self.buffer = self.buffer.convert()
+            self.buffer_state = None
+        width, height = screen_size
+        previous = self.buffer_state
+        if previous is not None and previous[2:] == state[2:]:
+            delta_x, delta_y = camera_x - previous[0], camera_y - previous[1]
+        else:
+            delta_x, delta_y = width, height  # Nothing in the buffer can be reused
+        strips = []
+        if abs(delta_x) >= width or abs(delta_y) >= height:
+            self.buffer_placeholders.clear()
+            strips.append(self.buffer.get_rect())
+            self.buffer_redraws += 1
+        elif delta_x or delta_y:
+            self.buffer.set_clip(None)
+            self.buffer.scroll(-delta_x, -delta_y)
+            if delta_x:
+                strips.append(pygame.Rect(width - delta_x if delta_x > 0 else 0, 0, abs(delta_x), height))
+            if delta_y:
+                strips.append(pygame.Rect(0, height - delta_y if delta_y > 0 else 0, width, abs(delta_y)))
+            self.buffer_scrolls += 1
+
+        # Placeholders still in the buffer whose chunk is ready now
+        ready = [chunk_key for chunk_key in self.buffer_placeholders if chunk_key in self.chunks]
+        self.buffer_placeholders.difference_update(ready)
+        strips.extend(self.get_chunk_screen_rect(chunk_key[0], chunk_key[1], camera_x, camera_y, screen_size) for chunk_key in ready)
+
+        for strip in strips:
+            self.draw_chunks(self.buffer, strip.clip(self.buffer.get_rect()), view_keys, camera_x, camera_y, level, in_buffer=True)
+        self.buffer.set_clip(None)
+        self.buffer_state = state
+
     def draw(self, screen, camera_x, camera_y):
         """Draw visible chunks based on camera position"""
-        # Convert camera position (player world position) to chunk coordinates
-        center_chunk_x = camera_x // (self.chunk_size * self.cell_size[0])
-        center_chunk_y = camera_y // (self.chunk_size * self.cell_size[1])
-
-        # Calculate pixel offset within the chunk
-        offset_x = -(camera_x % (self.chunk_size * self.cell_size[0]))
-        offset_y = -(camera_y % (self.chunk_size * self.cell_size[1]))
-
-        # Calculate screen center
-        screen_center_x = screen.get_width() // 2
-        screen_center_y = screen.get_height() // 2
-
-        # Determine visible chunks
-        chunks_visible_x = (screen.get_width() // (self.chunk_size * self.cell_size[0])) + 2
-        chunks_visible_y = (screen.get_height() // (self.chunk_size * self.cell_size[1])) + 2
-
-        # Draw all visible chunks
-        for chunk_x_offset in range(-chunks_visible_x, chunks_visible_x + 1):
-            for chunk_y_offset in range(-chunks_visible_y, chunks_visible_y + 1):
-                chunk_x = int(center_chunk_x) + chunk_x_offset
-                chunk_y = int(center_chunk_y) + chunk_y_offset
-                chunk = self.generate_chunk(chunk_x, chunk_y)
-
-                for segment in chunk:
-                    # Calculate segment's screen position
-                    screen_x = segment.x - camera_x + screen_center_x
-                    screen_y = segment.y - camera_y + screen_center_y
-
-                    # Check if segment is visible on screen
-                    if (screen_x + segment.width > 0 and
-                            screen_x < screen.get_width() and
-                            screen_y + segment.height > 0 and
-                            screen_y < screen.get_height()):
-                        # Draw segment at offset position
-                        pygame.draw.rect(screen, segment.color,
-                                         (screen_x, screen_y,
-                                          segment.width, segment.height))
\ No newline at end of file
+        self.check_render_settings()
+        # Zoomed out, the same number of chunks covers a 2 ** level times wider area
+        level = self.zoom_level
+        world_camera_x, world_camera_y = camera_x, camera_y
+        camera_x, camera_y = self.get_level_camera(camera_x, camera_y, level)
+        screen_size = screen.get_size()
+
+        # Chunks in view are never evicted
+        view_keys = self.get_view_keys(camera_x, camera_y, screen.get_width(), screen.get_height(), level, self.view_margin)
+        self.chunks.pin(view_keys)
+        self.chunk_surfaces.pin(view_keys)
+
+        background = self.generator is not None and self.generator.start()
+        if background and not self.updated:
+            self.integrate_finished_chunks()  # A caller that only draws
+
+        # Pinned chunks stay resident, so an unchanged, fully generated view needs no checks
+        if view_keys != self.resident_view_keys:
+            # Both paths look chunks up with chunks.get, so background generation counts hits and misses too
+            for chunk_key in view_keys:
+                chunk_x, chunk_y = chunk_key[0], chunk_key[1]
+                if not background:
+                    self.generate_chunk(chunk_x, chunk_y, level)
+                elif self.chunks.get(chunk_key) is None and self.load_chunk(chunk_x, chunk_y, level) is None:
+                    self.generator.request(chunk_key)
+            self.resident_view_keys = view_keys if all(chunk_key in self.chunks for chunk_key in view_keys) else None
+            self.placeholder_keys.intersection_update(view_keys)  # Out of view, nothing left to repaint
+
+        if self.scroll_buffer:
+            self.update_buffer(screen_size, view_keys, camera_x, camera_y, level)
+            self.show_buffer(screen, camera_x, camera_y)
+        else:
+            self.draw_chunks(screen, screen.get_clip(), view_keys, camera_x, camera_y, level)
+
+        if background:
+            # Prefetch around where the camera is heading
+            predicted_x, predicted_y = self.get_level_camera(*self.generator.track(world_camera_x, world_camera_y), level)
+            for chunk_key in self.get_view_keys(predicted_x, predicted_y, screen.get_width(), screen.get_height(), level, self.view_margin):
+                if chunk_key in self.chunks or (self.tile_store is not None and chunk_key in self.tile_store):
+                    continue
+                if not self.generator.request(chunk_key, prefetch=True):
+                    break